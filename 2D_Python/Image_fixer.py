@@ -1,10 +1,15 @@
-import json
+import orjson
 import numpy as np
 import sys
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 # --- CONFIGURATION ---
 # How close two road endings can be to be considered the same junction.
 SNAP_THRESHOLD = 10.0
+# Below this many junctions, endpoints are matched with a brute-force distance matrix instead of a KD-tree.
+SMALL_JUNCTION_COUNT = 256
 
 def process_map_data(input_filename="map_data.json", output_filename="map_data_cleaned.json"):
     """
@@ -15,12 +20,12 @@ def process_map_data(input_filename="map_data.json", output_filename="map_data_c
 
     # 1. Load the messy map data
     try:
-        with open(input_filename, 'r') as f:
-            map_data = json.load(f)
+        with open(input_filename, 'rb') as f:
+            map_data = orjson.loads(f.read())
         print(f"✅ Successfully loaded '{input_filename}'.")
     except FileNotFoundError:
         print(f"❌ FATAL ERROR: The file '{input_filename}' was not found. Aborting."); sys.exit()
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"❌ FATAL ERROR: Could not parse '{input_filename}'. Aborting."); sys.exit()
 
     edges = map_data.get('edges', [])
@@ -30,55 +35,61 @@ def process_map_data(input_filename="map_data.json", output_filename="map_data_c
 
     print(f"Found {len(edges)} roads to process.")
 
-    # 2. Collect all road endpoints
-    all_endpoints = [tuple(p) for edge in edges if len(edge['shape']) >= 2 for p in (edge['shape'][0], edge['shape'][-1])]
+    # 2. Collect all road endpoints (shapes are kept as (N, 2) arrays from here on)
+    routable_edges = [edge for edge in edges if len(edge['shape']) >= 2]
+    shapes = [np.array(edge['shape'], dtype=np.float64) for edge in routable_edges]
+    all_endpoints = [(shape[0], shape[-1]) for shape in shapes]
 
     # 3. Group nearby endpoints into clean, canonical junctions
     print(f"Grouping endpoints with a snap threshold of {SNAP_THRESHOLD}...")
-    junction_groups = []
-    for point in all_endpoints:
-        found_group = False
-        for group in junction_groups:
-            if np.linalg.norm(np.array(point) - np.mean(group, axis=0)) < SNAP_THRESHOLD:
-                group.append(point)
-                found_group = True
-                break
-        if not found_group:
-            junction_groups.append([point])
-
-    # Calculate the center of each group to create the final junction
-    junction_centers = {f"J{i}": np.mean(group, axis=0) for i, group in enumerate(junction_groups)}
+    pts = np.array(all_endpoints, dtype=np.float64).reshape(-1, 2)
+    # Roads meeting at one spot share identical endpoints; collapse those first so the
+    # pair search does not grow quadratically with the number of roads per junction
+    unique_pts, unique_ids = np.unique(pts, axis=0, return_inverse=True)
+    pairs = cKDTree(unique_pts).query_pairs(SNAP_THRESHOLD, output_type='ndarray')
+
+    # Endpoints linked by a chain of close pairs form one group (union-find done in compiled code)
+    adjacency = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(len(unique_pts), len(unique_pts)))
+    num_groups, unique_group_ids = connected_components(adjacency, directed=False)
+    group_ids = unique_group_ids[unique_ids.ravel()]
+
+    # Calculate the center of each group to create the final junction (per-group sum / count)
+    counts = np.bincount(group_ids, minlength=num_groups)
+    sums = np.column_stack([np.bincount(group_ids, weights=pts[:, axis], minlength=num_groups) for axis in (0, 1)])
+    centroids = sums / counts[:, None]
+    junction_centers = {f"J{i}": centroids[i] for i in range(len(centroids))}
     print(f"Identified {len(junction_centers)} clean junctions.")
 
-    def get_closest_junction_id(point_tuple):
-        """Finds the ID of the canonical junction center for a given point."""
-        point_np = np.array(point_tuple)
-        return min(junction_centers.keys(), key=lambda jid: np.linalg.norm(point_np - junction_centers[jid]))
+    # Snap every endpoint to its closest canonical junction center in one batched query.
+    # For the usual hand-drawn map a flat distance matrix beats building a second tree.
+    if 0 < num_groups < SMALL_JUNCTION_COUNT:
+        diff = pts[:, None, :] - centroids[None, :, :]
+        closest = np.einsum('ijk,ijk->ij', diff, diff).argmin(axis=1)
+    else:
+        _, closest = cKDTree(centroids).query(pts, k=1)
+    closest = closest.reshape(-1, 2)
 
     # 4. Rebuild the road network, connecting them to the new junction IDs
     print("Rebuilding road network with explicit connections...")
     cleaned_edges = []
-    for edge in edges:
-        if len(edge['shape']) < 2: continue
-
-        start_junction_id = get_closest_junction_id(tuple(edge['shape'][0]))
-        end_junction_id = get_closest_junction_id(tuple(edge['shape'][-1]))
+    for edge, shape, (start_idx, end_idx) in zip(routable_edges, shapes, closest):
+        start_junction_id, end_junction_id = f"J{start_idx}", f"J{end_idx}"
 
         # Don't create roads that loop back to the same junction
         if start_junction_id == end_junction_id: continue
 
         # The new shape starts and ends at the perfect junction centers
-        new_shape = [junction_centers[start_junction_id].tolist()] + edge['shape'][1:-1] + [junction_centers[end_junction_id].tolist()]
+        shape[0], shape[-1] = centroids[start_idx], centroids[end_idx]
 
         cleaned_edges.append({
             'from': start_junction_id,
             'to': end_junction_id,
-            'shape': new_shape,
+            'shape': shape,
             'width': edge['width']
         })
 
     # 5. Prepare the final data structure with explicit junctions
-    serializable_junctions = {jid: {'pos': pos.tolist()} for jid, pos in junction_centers.items()}
+    serializable_junctions = {jid: {'pos': pos} for jid, pos in junction_centers.items()}
     cleaned_map_data = {
         'junctions': serializable_junctions,
         'edges': cleaned_edges,
@@ -87,8 +98,8 @@ def process_map_data(input_filename="map_data.json", output_filename="map_data_c
 
     # 6. Save the cleaned data to a new file
     try:
-        with open(output_filename, 'w') as f:
-            json.dump(cleaned_map_data, f, indent=2)
+        with open(output_filename, 'wb') as f:
+            f.write(orjson.dumps(cleaned_map_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         print(f"✅ Success! Cleaned, routable map saved to '{output_filename}'.")
         print("\nYou can now use this new file in your simulation script.")
     except Exception as e:
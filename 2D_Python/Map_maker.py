@@ -2,7 +2,7 @@ import xml.etree.ElementTree as ET
 import pygame
 import sys
 import numpy as np
-import json
+import orjson
 
 # --- 1. NEW: High-Resolution Path Interpolation ---
 def interpolate_shape(points, step_distance=1.0):
@@ -10,59 +10,64 @@ def interpolate_shape(points, step_distance=1.0):
     Takes a list of points and adds new points between them, ensuring the
     distance between any two consecutive points is no more than step_distance.
     This creates high-resolution paths perfect for simulation.
+    Returns the path as a single (N, 2) array.
     """
-    high_res_points = []
-    if not points:
-        return high_res_points
+    pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    if len(pts) < 2:
+        return pts
 
-    high_res_points.append(points[0]) # Always add the first point
+    deltas = np.diff(pts, axis=0)
+    lengths = np.linalg.norm(deltas, axis=1)
+    # Every segment gets at least one step, which lands exactly on its end point
+    num_steps = np.maximum(1, (lengths / step_distance).astype(int))
 
-    for i in range(len(points) - 1):
-        p1, p2 = points[i], points[i+1]
-        distance = np.linalg.norm(p2 - p1)
+    # For every new point: which segment it belongs to and how far along it is
+    segment = np.repeat(np.arange(len(deltas)), num_steps)
+    step_index = np.arange(num_steps.sum()) - np.repeat(np.cumsum(num_steps) - num_steps, num_steps) + 1
+    alpha = (step_index / num_steps[segment]).astype(np.float32)
 
-        if distance > step_distance:
-            # Calculate how many new points to add
-            num_steps = int(distance / step_distance)
-            for j in range(1, num_steps + 1):
-                alpha = j / num_steps
-                interpolated_point = p1 * (1 - alpha) + p2 * alpha
-                high_res_points.append(interpolated_point)
-
-        high_res_points.append(p2) # Always add the last point of the segment
-
-    return high_res_points
+    interpolated = pts[segment] + deltas[segment] * alpha[:, None]
+    return np.concatenate([pts[:1], interpolated])
 
 # --- 2. PARSING FUNCTION (Now with Interpolation) ---
 def parse_and_process_net(net_file):
     print(f"Parsing and processing network file: {net_file}...")
-    try:
-        tree = ET.parse(net_file)
-        root = tree.getroot()
-    except ET.ParseError as e: return None, None
-
     junctions = {}
-    for junction in root.iter('junction'):
-        x_str, y_str = junction.get('x'), junction.get('y')
-        if x_str is not None and y_str is not None:
-            junctions[junction.get('id')] = {'pos': np.array([float(x_str), float(y_str)])}
-
     edges = []
     max_road_width = 0
-    for edge in root.iter('edge'):
-        lane = edge.find('lane')
-        if lane is not None:
-            shape_str, width_str = lane.get('shape'), lane.get('width')
-            if shape_str and width_str:
-                original_points = [np.array([float(p.split(',')[0]), float(p.split(',')[1])]) for p in shape_str.split(' ')]
-
-                # --- THIS IS THE KEY STEP ---
-                # Create a high-resolution version of the path
-                high_res_shape = interpolate_shape(original_points)
-
-                width = float(width_str)
-                edges.append({'shape': high_res_shape, 'width': width})
-                if width > max_road_width: max_road_width = width
+    try:
+        # Stream the file instead of building the whole DOM; each top-level element is dropped from the root once consumed
+        root, depth = None, 0
+        for event, elem in ET.iterparse(net_file, events=('start', 'end')):
+            if event == 'start':
+                if root is None: root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if elem.tag == 'junction':
+                x_str, y_str = elem.get('x'), elem.get('y')
+                if x_str is not None and y_str is not None:
+                    junctions[elem.get('id')] = {'pos': np.array([float(x_str), float(y_str)], dtype=np.float32)}
+            elif elem.tag == 'edge':
+                lane = elem.find('lane')
+                if lane is not None:
+                    shape_str, width_str = lane.get('shape'), lane.get('width')
+                    if shape_str and width_str:
+                        # SUMO shapes are "x1,y1 x2,y2 ..." (or "x,y,z" with elevation) - parse the whole string in
+                        # one C-level call, then keep x and y of each point
+                        fields = shape_str.split(' ', 1)[0].count(',') + 1
+                        original_points = np.fromstring(shape_str.replace(',', ' '), dtype=np.float32, sep=' ').reshape(-1, fields)[:, :2]
+
+                        # --- THIS IS THE KEY STEP ---
+                        # Create a high-resolution version of the path
+                        high_res_shape = interpolate_shape(original_points)
+
+                        width = float(width_str)
+                        edges.append({'shape': high_res_shape, 'width': width})
+                        if width > max_road_width: max_road_width = width
+            if depth == 1:
+                root.clear() # Nested elements (an edge's lanes) go with their top-level parent
+    except ET.ParseError as e: return None, None
 
     for j in junctions.values():
         j['fill_radius'] = max_road_width * 0.7
@@ -80,41 +85,54 @@ class MapViewer:
         self.BG_COLOR, self.ROAD_COLOR = (240, 240, 240), (100, 100, 100)
         self.zoom, self.offset = 1.0, np.array([0.0, 0.0])
         self.panning, self.pan_start_pos = False, np.array([0, 0])
+        # Screen-space cache: all edge points stacked once, re-transformed only when the camera moves
+        self._world_points = np.concatenate([edge['shape'] for edge in edges]) if edges else np.empty((0, 2), dtype=np.float32)
+        self._edge_lengths = np.array([len(edge['shape']) for edge in edges], dtype=int)
+        # Per-edge world-space bounding boxes (min_x, min_y, max_x, max_y) for off-screen culling
+        # (an edge with an empty shape gets an inverted box, so it is never considered visible)
+        self._edge_bounds = np.array([
+            np.concatenate([edge['shape'].min(axis=0), edge['shape'].max(axis=0)]) if len(edge['shape']) else [np.inf, np.inf, -np.inf, -np.inf]
+            for edge in edges
+        ], dtype=np.float32).reshape(-1, 4)
+        self._edge_widths = np.array([edge['width'] for edge in edges], dtype=np.float32)
+        self._junction_points = np.array([j['pos'] for j in junctions.values()], dtype=np.float32).reshape(-1, 2)
+        self._cam_key, self._cached_edges, self._cached_junctions = None, None, None
+        self._net_surface = None # Pre-rendered static road network, blitted every frame
+        self._dirty = True # Set by any event that changes the view; run() only redraws when it is set
         self.center_map()
 
     def save_map_to_json(self, filename="map_data.json"):
         print(f"\nSaving high-resolution map data to {filename}...")
-        serializable_junctions = {
-            jid: {'pos': data['pos'].tolist()} for jid, data in self.junctions.items()
-        }
-        serializable_edges = [
-            {'shape': [point.tolist() for point in edge['shape']], 'width': edge['width']}
-            for edge in self.edges
-        ]
+        # orjson writes the NumPy arrays directly, so no per-point .tolist() conversion is needed
+        serializable_junctions = {jid: {'pos': data['pos']} for jid, data in self.junctions.items()}
+        serializable_edges = [{'shape': edge['shape'], 'width': edge['width']} for edge in self.edges]
         map_data = {'junctions': serializable_junctions, 'edges': serializable_edges}
         try:
-            with open(filename, 'w') as f:
-                json.dump(map_data, f, indent=2) # Using indent=2 for smaller file size
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(map_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             print(f"✅ Success! High-fidelity map data saved to {filename}")
         except Exception as e:
             print(f"❌ Error! Could not save map data. Reason: {e}")
 
     def center_map(self):
         if not self.junctions: return
-        all_node_coords = np.array([j['pos'] for j in self.junctions.values()])
-        min_coords, max_coords = np.min(all_node_coords, axis=0), np.max(all_node_coords, axis=0)
+        all_node_coords = self._junction_points
+        min_coords, max_coords = all_node_coords.min(axis=0), all_node_coords.max(axis=0)
         map_center = (min_coords + max_coords) / 2.0
         map_size = np.where(max_coords - min_coords == 0, 1, max_coords - min_coords)
         zoom_x, zoom_y = self.width / map_size[0] * 0.9, self.height / map_size[1] * 0.9
-        self.zoom = min(zoom_x, zoom_y)
+        self.zoom = float(min(zoom_x, zoom_y))
         self.offset = np.array([self.width / 2.0, self.height / 2.0]) - map_center * self.zoom
 
     def world_to_screen(self, world_pos):
-        return np.array([world_pos[0], -world_pos[1]]) * self.zoom + self.offset
+        """Transforms a single (2,) point or a whole (N, 2) array of points at once."""
+        scale = np.array([self.zoom, -self.zoom], dtype=np.float32)
+        return np.asarray(world_pos, dtype=np.float32) * scale + self.offset.astype(np.float32)
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT: return False
+            if event.type != pygame.MOUSEMOTION or self.panning: self._dirty = True
             if event.type == pygame.VIDEORESIZE: self.width, self.height = event.size
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1: self.panning, self.pan_start_pos = True, np.array(event.pos)
@@ -130,28 +148,69 @@ class MapViewer:
                     self.save_map_to_json()
         return True
 
-    def draw(self):
-        self.screen.fill(self.BG_COLOR)
-        for j_data in self.junctions.values():
-            fill_radius = j_data['fill_radius'] * self.zoom
+    def visible_edge_mask(self):
+        """Tests every edge's world-space bounding box against the viewport in one NumPy op."""
+        x0, x1 = -self.offset[0] / self.zoom, (self.width - self.offset[0]) / self.zoom
+        y0, y1 = (self.offset[1] - self.height) / self.zoom, self.offset[1] / self.zoom
+        margin = self._edge_widths # Roads are drawn this wide, so keep ones just outside the view
+        bounds = self._edge_bounds
+        return (bounds[:, 2] + margin >= x0) & (bounds[:, 0] - margin <= x1) & (bounds[:, 3] + margin >= y0) & (bounds[:, 1] - margin <= y1)
+
+    def is_on_screen(self, screen_pos, radius):
+        return -radius <= screen_pos[0] <= self.width + radius and -radius <= screen_pos[1] <= self.height + radius
+
+    def update_screen_cache(self):
+        """Re-transforms the visible junctions and edges to screen space, but only if the camera changed."""
+        key = (self.zoom, self.offset[0], self.offset[1], self.width, self.height)
+        if key == self._cam_key: return
+        # Only edges whose bounding box overlaps the viewport are transformed and drawn
+        edge_mask = self.visible_edge_mask()
+        visible = np.flatnonzero(edge_mask)
+        # Whole-pixel int32 coordinates; pygame consumes plain lists of int pairs fastest
+        point_mask = np.repeat(edge_mask, self._edge_lengths)
+        screen_points = np.rint(self.world_to_screen(self._world_points[point_mask])).astype(np.int32)
+        edge_points = np.split(screen_points, np.cumsum(self._edge_lengths[visible])[:-1])
+        self._cached_edges = [
+            (points.tolist(), max(2, int(self.edges[i]['width'] * self.zoom)))
+            for points, i in zip(edge_points, visible)
+        ]
+        junction_points = self.world_to_screen(self._junction_points).tolist()
+        self._cached_junctions = [
+            (point, j_data['fill_radius'] * self.zoom)
+            for point, j_data in zip(junction_points, self.junctions.values())
+            if self.is_on_screen(point, j_data['fill_radius'] * self.zoom)
+        ]
+        self._cam_key = key
+        self.render_network()
+
+    def render_network(self):
+        """Draws the static junctions and roads once onto an off-screen surface."""
+        self._net_surface = pygame.Surface((self.width, self.height))
+        self._net_surface.fill(self.BG_COLOR)
+        for screen_pos, fill_radius in self._cached_junctions:
             if fill_radius > 1:
-                pygame.draw.circle(self.screen, self.ROAD_COLOR, self.world_to_screen(j_data['pos']), fill_radius)
-        for edge in self.edges:
-            shape, width = edge['shape'], edge['width']
-            scaled_width = int(width * self.zoom)
-            if scaled_width < 2: scaled_width = 2
-            screen_points = [self.world_to_screen(p) for p in shape]
+                pygame.draw.circle(self._net_surface, self.ROAD_COLOR, screen_pos, fill_radius)
+        for screen_points, scaled_width in self._cached_edges:
             if len(screen_points) > 1:
-                pygame.draw.lines(self.screen, self.ROAD_COLOR, False, screen_points, scaled_width)
-            for p in screen_points:
-                pygame.draw.circle(self.screen, self.ROAD_COLOR, p, scaled_width / 2)
+                pygame.draw.lines(self._net_surface, self.ROAD_COLOR, False, screen_points, scaled_width)
+            # Consecutive segments already join; only round off the two ends of each road
+            for p in (screen_points[0], screen_points[-1]):
+                pygame.draw.circle(self._net_surface, self.ROAD_COLOR, p, scaled_width / 2)
+
+    def draw(self):
+        self.update_screen_cache()
+        self.screen.blit(self._net_surface, (0, 0))
         pygame.display.flip()
 
     def run(self):
         running = True
         while running:
             running = self.handle_events()
-            self.draw()
+            if self._dirty:
+                self.draw()
+                self._dirty = False
+            else:
+                pygame.time.wait(16) # Nothing changed; idle instead of repainting the same frame
         pygame.quit()
         sys.exit()
 
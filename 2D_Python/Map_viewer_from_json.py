@@ -1,26 +1,26 @@
 import pygame
 import sys
 import numpy as np
-import json
+import orjson
 
 # --- 1. DATA HANDLING (UPDATED to handle 'sites') ---
 def load_map_from_json(filename="map_data.json"):
     """Loads map data including junctions, edges, and special sites."""
     print(f"Loading map data from {filename}...")
     try:
-        with open(filename, 'r') as f:
-            map_data = json.load(f)
+        with open(filename, 'rb') as f:
+            map_data = orjson.loads(f.read())
     except FileNotFoundError:
         print(f"❌ Error! The file '{filename}' was not found.")
         return None, None, None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"❌ Error! The file '{filename}' is not a valid JSON file.")
         return None, None, None
 
-    junctions = {jid: {'pos': np.array(data['pos'])} for jid, data in map_data.get('junctions', {}).items()}
-    edges = [{'shape': [np.array(p) for p in edge['shape']], 'width': edge['width']} for edge in map_data.get('edges', [])]
+    junctions = {jid: {'pos': np.array(data['pos'], dtype=np.float32)} for jid, data in map_data.get('junctions', {}).items()}
+    edges = [{'shape': np.asarray(edge['shape'], dtype=np.float32).reshape(-1, 2), 'width': edge['width']} for edge in map_data.get('edges', [])]
     # --- ADDED: Load sites ---
-    sites = {sid: {'type': data['type'], 'pos': np.array(data['pos'])} for sid, data in map_data.get('sites', {}).items()}
+    sites = {sid: {'type': data['type'], 'pos': np.array(data['pos'], dtype=np.float32)} for sid, data in map_data.get('sites', {}).items()}
 
     # Re-calculate fill radius for drawing junctions seamlessly
     max_road_width = 0
@@ -48,34 +48,53 @@ class MapViewer:
         # Camera controls
         self.zoom, self.offset = 1.0, np.array([0.0, 0.0])
         self.panning, self.pan_start_pos = False, np.array([0, 0])
+
+        # Screen-space cache: all edge points stacked once, re-transformed only when the camera moves
+        self._world_points = np.concatenate([edge['shape'] for edge in edges]) if edges else np.empty((0, 2), dtype=np.float32)
+        self._edge_lengths = np.array([len(edge['shape']) for edge in edges], dtype=int)
+        # Per-edge world-space bounding boxes (min_x, min_y, max_x, max_y) for off-screen culling
+        # (an edge with an empty shape gets an inverted box, so it is never considered visible)
+        self._edge_bounds = np.array([
+            np.concatenate([edge['shape'].min(axis=0), edge['shape'].max(axis=0)]) if len(edge['shape']) else [np.inf, np.inf, -np.inf, -np.inf]
+            for edge in edges
+        ], dtype=np.float32).reshape(-1, 4)
+        self._edge_widths = np.array([edge['width'] for edge in edges], dtype=np.float32)
+        self._junction_points = np.array([j['pos'] for j in junctions.values()], dtype=np.float32).reshape(-1, 2)
+        site_points = np.array([s['pos'] for s in sites.values()], dtype=np.float32).reshape(-1, 2)
+        self._all_points = np.concatenate([self._junction_points, self._world_points, site_points]) # Used for centering
+        self._cam_key, self._cached_edges, self._cached_junctions = None, None, None
+        self._net_surface = None # Pre-rendered static road network, blitted every frame
+        self._dirty = True # Set by any event that changes the view; run() only redraws when it is set
         self.center_map()
 
     def center_map(self):
         # --- MODIFIED to include all map elements in centering ---
-        all_points = []
-        if self.junctions: all_points.extend([j['pos'] for j in self.junctions.values()])
-        if self.edges: all_points.extend(p for edge in self.edges for p in edge['shape'])
-        if self.sites: all_points.extend([s['pos'] for s in self.sites.values()])
-
-        if not all_points:
+        all_points = self._all_points
+        if len(all_points) == 0:
             self.offset = np.array([self.width / 2.0, self.height / 2.0])
             return
 
-        all_points = np.array(all_points)
         min_coords, max_coords = np.min(all_points, axis=0), np.max(all_points, axis=0)
         map_center = (min_coords + max_coords) / 2.0
         map_size = np.where(max_coords - min_coords == 0, 1, max_coords - min_coords)
         zoom_x = self.width / map_size[0] * 0.9 if map_size[0] > 0 else 1
         zoom_y = self.height / map_size[1] * 0.9 if map_size[1] > 0 else 1
-        self.zoom = min(zoom_x, zoom_y)
+        self.zoom = float(min(zoom_x, zoom_y))
         self.offset = np.array([self.width / 2.0, self.height / 2.0]) - map_center * self.zoom
 
     def world_to_screen(self, world_pos):
-        return np.array([world_pos[0], -world_pos[1]]) * self.zoom + self.offset
+        """Transforms a single (2,) point or a whole (N, 2) array of points at once."""
+        scale = np.array([self.zoom, -self.zoom], dtype=np.float32)
+        return np.asarray(world_pos, dtype=np.float32) * scale + self.offset.astype(np.float32)
+
+    def point_to_screen(self, x, y):
+        """Scalar version of world_to_screen for single points; plain floats avoid NumPy's per-call overhead."""
+        return x * self.zoom + self.offset[0], self.offset[1] - y * self.zoom
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT: return False
+            if event.type != pygame.MOUSEMOTION or self.panning: self._dirty = True
             if event.type == pygame.VIDEORESIZE: self.width, self.height = event.size
             if event.type == pygame.MOUSEBUTTONDOWN:
                 # Use right-click for panning to avoid accidental interaction
@@ -89,27 +108,66 @@ class MapViewer:
                 self.zoom *= (1.1 if event.y > 0 else 0.9)
         return True
 
-    def draw(self):
-        self.screen.fill(self.BG_COLOR)
-        # Draw junctions to fill gaps
-        for j_data in self.junctions.values():
-            fill_radius = j_data['fill_radius'] * self.zoom
+    def visible_edge_mask(self):
+        """Tests every edge's world-space bounding box against the viewport in one NumPy op."""
+        x0, x1 = -self.offset[0] / self.zoom, (self.width - self.offset[0]) / self.zoom
+        y0, y1 = (self.offset[1] - self.height) / self.zoom, self.offset[1] / self.zoom
+        margin = self._edge_widths # Roads are drawn this wide, so keep ones just outside the view
+        bounds = self._edge_bounds
+        return (bounds[:, 2] + margin >= x0) & (bounds[:, 0] - margin <= x1) & (bounds[:, 3] + margin >= y0) & (bounds[:, 1] - margin <= y1)
+
+    def is_on_screen(self, screen_pos, radius):
+        return -radius <= screen_pos[0] <= self.width + radius and -radius <= screen_pos[1] <= self.height + radius
+
+    def update_screen_cache(self):
+        """Re-transforms the visible junctions and edges to screen space, but only if the camera changed."""
+        key = (self.zoom, self.offset[0], self.offset[1], self.width, self.height)
+        if key == self._cam_key: return
+        # Only edges whose bounding box overlaps the viewport are transformed and drawn
+        edge_mask = self.visible_edge_mask()
+        visible = np.flatnonzero(edge_mask)
+        # Whole-pixel int32 coordinates; pygame consumes plain lists of int pairs fastest
+        point_mask = np.repeat(edge_mask, self._edge_lengths)
+        screen_points = np.rint(self.world_to_screen(self._world_points[point_mask])).astype(np.int32)
+        edge_points = np.split(screen_points, np.cumsum(self._edge_lengths[visible])[:-1])
+        self._cached_edges = [
+            (points.tolist(), max(2, int(self.edges[i]['width'] * self.zoom)))
+            for points, i in zip(edge_points, visible) if len(points) > 1
+        ]
+        junction_points = self.world_to_screen(self._junction_points).tolist()
+        self._cached_junctions = [
+            (point, j_data['fill_radius'] * self.zoom)
+            for point, j_data in zip(junction_points, self.junctions.values())
+            if self.is_on_screen(point, j_data['fill_radius'] * self.zoom)
+        ]
+        self._cam_key = key
+        self.render_network()
+
+    def render_network(self):
+        """Draws the static junctions and roads once onto an off-screen surface."""
+        self._net_surface = pygame.Surface((self.width, self.height))
+        self._net_surface.fill(self.BG_COLOR)
+        for screen_pos, fill_radius in self._cached_junctions:
             if fill_radius > 1:
-                pygame.draw.circle(self.screen, self.ROAD_COLOR, self.world_to_screen(j_data['pos']), fill_radius)
-        # Draw roads
-        for edge in self.edges:
-            if len(edge['shape']) > 1:
-                scaled_width = int(edge['width'] * self.zoom); scaled_width = max(2, scaled_width)
-                screen_points = [self.world_to_screen(p) for p in edge['shape']]
-                pygame.draw.lines(self.screen, self.ROAD_COLOR, False, screen_points, scaled_width)
-                for p in screen_points:
-                    pygame.draw.circle(self.screen, self.ROAD_COLOR, p, scaled_width / 2)
+                pygame.draw.circle(self._net_surface, self.ROAD_COLOR, screen_pos, fill_radius)
+        for screen_points, scaled_width in self._cached_edges:
+            if len(screen_points) > 1:
+                pygame.draw.lines(self._net_surface, self.ROAD_COLOR, False, screen_points, scaled_width)
+            # Consecutive segments already join; only round off the two ends of each road
+            for p in (screen_points[0], screen_points[-1]):
+                pygame.draw.circle(self._net_surface, self.ROAD_COLOR, p, scaled_width / 2)
+
+    def draw(self):
+        self.update_screen_cache()
+        # Static roads come from the cached surface; only the sites are drawn on top
+        self.screen.blit(self._net_surface, (0, 0))
 
         # --- ADDED: Draw sites ---
         site_radius = int(10 * self.zoom)
         for site_id, data in self.sites.items():
             color = self.DUMP_COLOR if data['type'] == 'dump_site' else self.COAL_COLOR
-            pos = self.world_to_screen(data['pos'])
+            pos = self.point_to_screen(*data['pos'].tolist())
+            if not self.is_on_screen(pos, site_radius): continue
             pygame.draw.rect(self.screen, color, (pos[0]-site_radius, pos[1]-site_radius, site_radius*2, site_radius*2))
 
         pygame.display.flip()
@@ -118,7 +176,11 @@ class MapViewer:
         running = True
         while running:
             running = self.handle_events()
-            self.draw()
+            if self._dirty:
+                self.draw()
+                self._dirty = False
+            else:
+                pygame.time.wait(16) # Nothing changed; idle instead of repainting the same frame
         pygame.quit()
         sys.exit()
 
@@ -1,26 +1,28 @@
 import pygame
 import sys
 import numpy as np
-import json
+import orjson
+from scipy.spatial import cKDTree
 
 # --- 1. DATA HANDLING (UPDATED to handle 'sites') ---
 def load_map_from_json(filename="map_data.json"):
     """Loads map data including junctions, edges, and special sites."""
     print(f"Loading map data from {filename}...")
     try:
-        with open(filename, 'r') as f:
-            map_data = json.load(f)
+        with open(filename, 'rb') as f:
+            map_data = orjson.loads(f.read())
     except FileNotFoundError:
         print(f"Info: '{filename}' not found. Starting with a blank canvas.")
         return {}, [], {} # Return empty sites dict
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Error! Could not parse '{filename}'. Starting with a blank canvas.")
         return {}, [], {} # Return empty sites dict
 
-    junctions = {jid: {'pos': np.array(data['pos'])} for jid, data in map_data.get('junctions', {}).items()}
-    edges = [{'shape': [np.array(p) for p in edge['shape']], 'width': edge['width']} for edge in map_data.get('edges', [])]
+    # Positions are stored as float32: plenty for map coordinates, and half the data to move in every transform
+    junctions = {jid: {'pos': np.array(data['pos'], dtype=np.float32)} for jid, data in map_data.get('junctions', {}).items()}
+    edges = [{'shape': np.array(edge['shape'], dtype=np.float32).reshape(-1, 2), 'width': edge['width']} for edge in map_data.get('edges', [])]
     # --- ADDED: Load sites ---
-    sites = {sid: {'type': data['type'], 'pos': np.array(data['pos'])} for sid, data in map_data.get('sites', {}).items()}
+    sites = {sid: {'type': data['type'], 'pos': np.array(data['pos'], dtype=np.float32)} for sid, data in map_data.get('sites', {}).items()}
 
     print(f"Loaded {len(junctions)} junctions, {len(edges)} edges, and {len(sites)} sites.")
     return junctions, edges, sites
@@ -29,9 +31,24 @@ def load_map_from_json(filename="map_data.json"):
 class MapEditor:
     def __init__(self, junctions, edges, sites): # ADDED sites
         pygame.init()
-        self.junctions, self.edges, self.sites = junctions, edges, sites # ADDED sites
+        self.junctions, self.sites = junctions, sites # ADDED sites
+        # Roads are stored SoA/CSR-style: every point in one contiguous (N, 2) float32 array,
+        # edge i owning rows edge_offsets[i]:edge_offsets[i+1], plus one width per edge
+        # (edges with an empty shape are dropped; there is nothing to draw, erase or bound)
+        edges = [edge for edge in edges if len(edge['shape'])]
+        shapes = [np.asarray(edge['shape'], dtype=np.float32).reshape(-1, 2) for edge in edges]
+        self.edge_points = np.concatenate(shapes) if shapes else np.empty((0, 2), dtype=np.float32)
+        self.edge_offsets = np.concatenate([[0], np.cumsum([len(shape) for shape in shapes])]).astype(np.int32)
+        self.edge_widths = np.array([edge['width'] for edge in edges], dtype=np.float32)
+        # Per-edge world-space bounding boxes (min_x, min_y, max_x, max_y) for off-screen culling
+        self.edge_bbox = np.hstack([
+            np.minimum.reduceat(self.edge_points, self.edge_offsets[:-1]), np.maximum.reduceat(self.edge_points, self.edge_offsets[:-1])
+        ]) if shapes else np.empty((0, 4), dtype=np.float32)
+        # Junction and site positions as (J, 2) / (S, 2) arrays; site_pos follows the order of self.sites
+        self.junction_pos = np.array([j['pos'] for j in junctions.values()], dtype=np.float32).reshape(-1, 2)
+        self.update_site_positions()
         self.width, self.height = 1200, 900
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE | pygame.DOUBLEBUF)
         pygame.display.set_caption("Map Editor | Draw/Erase/Place Sites | Press 'S' to Save")
 
         # Colors and settings
@@ -53,33 +70,100 @@ class MapEditor:
         self.new_road_points = []
         self.DEFAULT_ROAD_WIDTH = 4.0
         self.ERASER_RADIUS = 15
+        self._last_erase_pos = None # Screen position the eraser was last applied at during the current drag
         # --- ADDED: State for warnings ---
         self.unreachable_sites = set()
         self.warning_flash_timer = 0
+        # KD-tree over every road point (plus which edge each point belongs to); rebuilt lazily after edits
+        self._road_index = None
+        # Spatial hash for the eraser: grid cell -> indices of the edges with a point in that cell
+        self.ERASE_CELL_SIZE = 2.0 * self.ERASER_RADIUS # World units; roughly one eraser diameter at zoom 1
+        self._edge_cells = {}
+        for i in range(self.num_edges()):
+            self.hash_edge(i)
+        # Roads and sites pre-rendered off-screen; redrawn only after an edit or a camera change
+        self._map_surface, self._map_cam_key, self._map_dirty = None, None, True
+        # Eraser cursor drawn once onto a small transparent surface and blitted at the mouse each frame
+        self._eraser_surface = pygame.Surface((self.ERASER_RADIUS * 2, self.ERASER_RADIUS * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self._eraser_surface, self.ERASER_COLOR, (self.ERASER_RADIUS, self.ERASER_RADIUS), self.ERASER_RADIUS)
 
         # UI element positions (ADDED new buttons)
         self.ui_buttons = {
             "draw": pygame.Rect(10, 10, 40, 40), "erase": pygame.Rect(60, 10, 40, 40),
             "place_dump": pygame.Rect(10, 60, 40, 40), "place_coal": pygame.Rect(60, 60, 40, 40)
         }
+        # Font and button glyphs are created once instead of every frame
+        self._ui_font = pygame.font.SysFont(None, 30)
+        self._icon_D = self._ui_font.render('D', True, self.UI_ICON_COLOR)
+        self._icon_C = self._ui_font.render('C', True, self.UI_ICON_COLOR)
+        self.render_ui_overlay()
         self.center_map()
 
+    def update_site_positions(self):
+        """Rebuilds site_pos after self.sites changes."""
+        self.site_pos = np.array([data['pos'] for data in self.sites.values()], dtype=np.float32).reshape(-1, 2)
+
+    def num_edges(self):
+        return len(self.edge_widths)
+
+    def edge_shape(self, i):
+        """The (N, 2) point array of edge i (a view into edge_points)."""
+        return self.edge_points[self.edge_offsets[i]:self.edge_offsets[i + 1]]
+
+    def hash_edge(self, i):
+        """Registers edge i in every spatial-hash cell one of its points falls into."""
+        for cell in np.unique(np.floor(self.edge_shape(i) / self.ERASE_CELL_SIZE).astype(np.int64), axis=0).tolist():
+            self._edge_cells.setdefault(tuple(cell), []).append(i)
+
+    def add_edge(self, points, width):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.edge_points = np.concatenate([self.edge_points, points])
+        self.edge_offsets = np.append(self.edge_offsets, self.edge_offsets[-1] + len(points)).astype(np.int32)
+        self.edge_widths = np.append(self.edge_widths, np.float32(width))
+        self.edge_bbox = np.vstack([self.edge_bbox, np.concatenate([points.min(axis=0), points.max(axis=0)])])
+        self.hash_edge(self.num_edges() - 1)
+        self._road_index = None
+        self._map_dirty = True
+
+    def remove_edges(self, remove_mask):
+        """Drops every edge whose entry in the boolean remove_mask is True."""
+        keep = ~remove_mask
+        lengths = np.diff(self.edge_offsets)
+        self.edge_points = self.edge_points[np.repeat(keep, lengths)]
+        self.edge_offsets = np.concatenate([[0], np.cumsum(lengths[keep])]).astype(np.int32)
+        self.edge_widths = self.edge_widths[keep]
+        self.edge_bbox = self.edge_bbox[keep]
+        # Surviving edges shift down to fill the gaps; renumber them in the spatial hash
+        new_index = (np.cumsum(keep) - 1).tolist()
+        for cell, edge_ids in list(self._edge_cells.items()):
+            edge_ids = [new_index[i] for i in edge_ids if keep[i]]
+            if edge_ids: self._edge_cells[cell] = edge_ids
+            else: del self._edge_cells[cell]
+        self._road_index = None
+        self._map_dirty = True
+
+    def road_index(self):
+        """Returns a cached (cKDTree of all road points, edge index of each point) pair."""
+        if self._road_index is None:
+            point_edge = np.repeat(np.arange(self.num_edges()), np.diff(self.edge_offsets))
+            self._road_index = (cKDTree(self.edge_points), point_edge)
+        return self._road_index
+
     # --- ADDED: Connectivity Check ---
     def check_site_connectivity(self):
         """Checks if all sites are connected to a road. Returns True if all are connected."""
         self.unreachable_sites.clear()
-        for site_id, site_data in self.sites.items():
-            is_reachable = False
-            for edge in self.edges:
-                for point in edge['shape']:
-                    # Check distance from site to every point on every road
-                    if np.linalg.norm(site_data['pos'] - point) < self.CONNECTIVITY_THRESHOLD:
-                        is_reachable = True
-                        break
-                if is_reachable:
-                    break
-            if not is_reachable:
-                self.unreachable_sites.add(site_id)
+        if not self.sites: return True
+        site_ids = list(self.sites)
+        if self.num_edges() == 0:
+            self.unreachable_sites.update(site_ids)
+            return False
+
+        # Nearest road point for every site in one batched query
+        tree, _ = self.road_index()
+        dists, _ = tree.query(self.site_pos, k=1, distance_upper_bound=self.CONNECTIVITY_THRESHOLD)
+        reachable = dists < self.CONNECTIVITY_THRESHOLD
+        self.unreachable_sites.update(sid for sid, ok in zip(site_ids, reachable) if not ok)
 
         return not self.unreachable_sites # Return True if the unreachable set is empty
 
@@ -91,46 +175,44 @@ class MapEditor:
             return # Abort the save
 
         print(f"Saving current map state to {filename}...")
-        serializable_junctions = {jid: {'pos': data['pos'].tolist()} for jid, data in self.junctions.items()}
-        serializable_edges = [{'shape': [p.tolist() for p in edge['shape']], 'width': edge['width']} for edge in self.edges]
+        # orjson writes the NumPy arrays directly, so positions need no .tolist() conversion
+        serializable_junctions = {jid: {'pos': data['pos']} for jid, data in self.junctions.items()}
+        serializable_edges = [{'shape': self.edge_shape(i), 'width': float(width)} for i, width in enumerate(self.edge_widths)]
         # --- ADDED: Save sites data ---
-        serializable_sites = {sid: {'type': data['type'], 'pos': data['pos'].tolist()} for sid, data in self.sites.items()}
+        serializable_sites = {sid: {'type': data['type'], 'pos': data['pos']} for sid, data in self.sites.items()}
 
         map_data = {'junctions': serializable_junctions, 'edges': serializable_edges, 'sites': serializable_sites}
         try:
-            with open(filename, 'w') as f:
-                json.dump(map_data, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(map_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             print(f"✅ Success! Map saved.")
         except Exception as e:
             print(f"❌ Error! Could not save map. Reason: {e}")
 
     def center_map(self):
         # --- MODIFIED to include sites in centering ---
-        all_points = []
-        if self.junctions: all_points.extend([j['pos'] for j in self.junctions.values()])
-        if self.edges: all_points.extend(p for edge in self.edges for p in edge['shape'])
-        if self.sites: all_points.extend([s['pos'] for s in self.sites.values()])
+        all_points = np.concatenate([self.junction_pos, self.edge_points, self.site_pos])
 
-        if not all_points:
+        if not len(all_points):
             self.offset = np.array([self.width / 2.0, self.height / 2.0])
             return
 
-        all_points = np.array(all_points)
         min_coords, max_coords = np.min(all_points, axis=0), np.max(all_points, axis=0)
         map_center = (min_coords + max_coords) / 2.0
         map_size = np.where(max_coords - min_coords == 0, 1, max_coords - min_coords)
         zoom_x = self.width / map_size[0] * 0.9 if map_size[0] > 0 else 1
         zoom_y = self.height / map_size[1] * 0.9 if map_size[1] > 0 else 1
-        self.zoom = min(zoom_x, zoom_y)
+        self.zoom = float(min(zoom_x, zoom_y))
         self.offset = np.array([self.width / 2.0, self.height / 2.0]) - map_center * self.zoom
 
     def screen_to_world(self, screen_pos):
-        p = (np.array(screen_pos) - self.offset) / self.zoom
-        return np.array([p[0], -p[1]])
+        # Plain float math: this runs for single mouse positions, where NumPy's overhead exceeds the work
+        return (screen_pos[0] - self.offset[0]) / self.zoom, (self.offset[1] - screen_pos[1]) / self.zoom
 
     def world_to_screen(self, world_pos):
-        p = np.array([world_pos[0], -world_pos[1]])
-        return p * self.zoom + self.offset
+        """Transforms a single (2,) point or a whole (N, 2) array of points at once."""
+        scale = np.array([self.zoom, -self.zoom], dtype=np.float32)
+        return np.asarray(world_pos, dtype=np.float32) * scale + self.offset.astype(np.float32)
 
     # --- ADDED: Site placement logic ---
     def place_site(self, site_type, pos):
@@ -142,8 +224,11 @@ class MapEditor:
             while f"COAL_{i}" in self.sites:
                 i += 1
             self.sites[f"COAL_{i}"] = {'type': 'coal_mine', 'pos': pos}
+        self.update_site_positions()
+        self._map_dirty = True
 
     def handle_events(self):
+        erase_pos = None # Erase drags are coalesced: one sweep per frame, from the last erased position to the latest one
         for event in pygame.event.get():
             if event.type == pygame.QUIT: return False
             if event.type == pygame.VIDEORESIZE: self.width, self.height = event.size
@@ -164,6 +249,7 @@ class MapEditor:
                     self.new_road_points = [self.screen_to_world(event.pos)]
                 elif self.tool == "erase":
                     self.erase_at_pos(event.pos)
+                    self._last_erase_pos = event.pos
                 elif self.tool == "place_dump":
                     self.place_site("dump_site", self.screen_to_world(event.pos))
                 elif self.tool == "place_coal":
@@ -177,7 +263,9 @@ class MapEditor:
             if event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     if self.tool == "draw" and len(self.new_road_points) > 1:
-                        self.edges.append({'shape': self.new_road_points, 'width': self.DEFAULT_ROAD_WIDTH})
+                        self.add_edge(self.new_road_points, self.DEFAULT_ROAD_WIDTH)
+                    if erase_pos is not None: self.erase_along(erase_pos)
+                    erase_pos, self._last_erase_pos = None, None
                     self.is_drawing = False
                     self.new_road_points = []
                 if event.button == 3: self.panning = False
@@ -187,78 +275,143 @@ class MapEditor:
                     self.offset += np.array(event.pos) - self.pan_start_pos
                     self.pan_start_pos = np.array(event.pos)
                 elif self.is_drawing:
-                    if self.tool == "draw": self.new_road_points.append(self.screen_to_world(event.pos))
-                    elif self.tool == "erase": self.erase_at_pos(event.pos)
+                    if self.tool == "draw":
+                        # Skip points less than ~2 pixels from the last one; they add nothing visible
+                        x, y = self.screen_to_world(event.pos)
+                        last_x, last_y = self.new_road_points[-1]
+                        if (x - last_x) ** 2 + (y - last_y) ** 2 > (2.0 / self.zoom) ** 2:
+                            self.new_road_points.append((x, y))
+                    elif self.tool == "erase": erase_pos = event.pos
 
             if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
                 self.save_map_to_json()
+        if erase_pos is not None: self.erase_along(erase_pos)
         return True
 
+    def erase_along(self, screen_pos):
+        # Steps at most one eraser radius apart, so a fast drag still clears every road it passed over
+        start = self._last_erase_pos if self._last_erase_pos is not None else screen_pos
+        dx, dy = screen_pos[0] - start[0], screen_pos[1] - start[1]
+        steps = max(1, int(np.ceil(np.hypot(dx, dy) / self.ERASER_RADIUS)))
+        for k in range(1, steps + 1):
+            self.erase_at_pos((start[0] + dx * k / steps, start[1] + dy * k / steps))
+        self._last_erase_pos = screen_pos
+
     def erase_at_pos(self, screen_pos):
         world_pos = self.screen_to_world(screen_pos)
         erase_radius_world = self.ERASER_RADIUS / self.zoom
-        # Erase edges
-        self.edges[:] = [edge for edge in self.edges if not any(np.linalg.norm(p - world_pos) < erase_radius_world for p in edge['shape'])]
-        # --- ADDED: Erase sites ---
-        self.sites = {sid: data for sid, data in self.sites.items() if np.linalg.norm(data['pos'] - world_pos) > erase_radius_world}
-
-    def draw_ui(self):
-        # --- MODIFIED to draw 4 buttons ---
-        for tool_name, rect in self.ui_buttons.items():
-            pygame.draw.circle(self.screen, self.UI_BG_COLOR, rect.center, 20)
-            if self.tool == tool_name:
-                pygame.draw.circle(self.screen, self.UI_HIGHLIGHT_COLOR, rect.center, 22, 3)
+        erase_radius_sq = erase_radius_world ** 2
+        # Erase edges that have any point inside the eraser circle; only edges hashed to
+        # the grid cells the circle overlaps are tested
+        cell = self.ERASE_CELL_SIZE
+        x0, x1 = int(np.floor((world_pos[0] - erase_radius_world) / cell)), int(np.floor((world_pos[0] + erase_radius_world) / cell))
+        y0, y1 = int(np.floor((world_pos[1] - erase_radius_world) / cell)), int(np.floor((world_pos[1] + erase_radius_world) / cell))
+        candidates = {i for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1) for i in self._edge_cells.get((cx, cy), ())}
+        if candidates:
+            remove_mask = np.zeros(self.num_edges(), dtype=bool)
+            for i in candidates:
+                shape = self.edge_shape(i)
+                remove_mask[i] = (((shape - world_pos) ** 2).sum(axis=1) <= erase_radius_sq).any()
+            if remove_mask.any():
+                self.remove_edges(remove_mask)
+        # --- ADDED: Erase sites --- (one vectorized distance test for all sites)
+        if self.sites:
+            keep = ((self.site_pos - world_pos) ** 2).sum(axis=1) > erase_radius_sq
+            if not keep.all():
+                self.sites = {sid: data for (sid, data), kept in zip(self.sites.items(), keep) if kept}
+                self.site_pos = self.site_pos[keep]
+                self._map_dirty = True
+
+    def render_ui_overlay(self):
+        """Pre-draws the static tool buttons and their icons once; draw_ui only adds the highlight ring."""
+        self._ui_overlay = pygame.Surface((110, 110), pygame.SRCALPHA)
+        for rect in self.ui_buttons.values():
+            pygame.draw.circle(self._ui_overlay, self.UI_BG_COLOR, rect.center, 20)
         # Icons
         p1 = self.ui_buttons["draw"].center + np.array([-8, 8]); p2 = self.ui_buttons["draw"].center + np.array([8, -8])
-        pygame.draw.line(self.screen, self.UI_ICON_COLOR, p1, p2, 4)
-        pygame.draw.polygon(self.screen, self.UI_ICON_COLOR, [p1, p1+np.array([4,-4]), p1+np.array([0,4])])
+        pygame.draw.line(self._ui_overlay, self.UI_ICON_COLOR, p1, p2, 4)
+        pygame.draw.polygon(self._ui_overlay, self.UI_ICON_COLOR, [p1, p1+np.array([4,-4]), p1+np.array([0,4])])
         eraser_icon_rect = pygame.Rect(0,0, 20, 15); eraser_icon_rect.center = self.ui_buttons["erase"].center
-        pygame.draw.rect(self.screen, self.UI_ICON_COLOR, eraser_icon_rect, 0, 3)
-        font = pygame.font.SysFont(None, 30)
-        dump_text = font.render('D', True, self.UI_ICON_COLOR); self.screen.blit(dump_text, self.ui_buttons["place_dump"].center - np.array([7,10]))
-        coal_text = font.render('C', True, self.UI_ICON_COLOR); self.screen.blit(coal_text, self.ui_buttons["place_coal"].center - np.array([7,10]))
+        pygame.draw.rect(self._ui_overlay, self.UI_ICON_COLOR, eraser_icon_rect, 0, 3)
+        self._ui_overlay.blit(self._icon_D, self.ui_buttons["place_dump"].center - np.array([7,10]))
+        self._ui_overlay.blit(self._icon_C, self.ui_buttons["place_coal"].center - np.array([7,10]))
 
-    def draw(self):
-        self.screen.fill(self.BG_COLOR)
-        # Draw existing roads
-        for edge in self.edges:
-            if len(edge['shape']) > 1:
-                scaled_width = int(edge['width'] * self.zoom); scaled_width = max(2, scaled_width)
-                screen_points = [self.world_to_screen(p) for p in edge['shape']]
-                pygame.draw.lines(self.screen, self.ROAD_COLOR, False, screen_points, scaled_width)
+    def draw_ui(self):
+        # --- MODIFIED to draw 4 buttons ---
+        self.screen.blit(self._ui_overlay, (0, 0))
+        if self.tool in self.ui_buttons:
+            pygame.draw.circle(self.screen, self.UI_HIGHLIGHT_COLOR, self.ui_buttons[self.tool].center, 22, 3)
+
+    def render_map(self):
+        """Draws the static roads and sites onto the off-screen map surface."""
+        self._map_surface = pygame.Surface((self.width, self.height))
+        self._map_surface.fill(self.BG_COLOR)
+        # Draw existing roads; only edges overlapping the viewport are transformed, all in one
+        # float32 pass with a single int32 cast, then split back into per-edge point lists
+        edge_mask = self.visible_edge_mask()
+        lengths = np.diff(self.edge_offsets)
+        visible = np.flatnonzero(edge_mask)
+        all_screen_points = self.world_to_screen(self.edge_points[np.repeat(edge_mask, lengths)]).astype(np.int32)
+        for i, screen_points in zip(visible, np.split(all_screen_points, np.cumsum(lengths[visible])[:-1])):
+            if len(screen_points) > 1:
+                scaled_width = int(self.edge_widths[i] * self.zoom); scaled_width = max(2, scaled_width)
+                screen_points = screen_points.tolist()
+                pygame.draw.lines(self._map_surface, self.ROAD_COLOR, False, screen_points, scaled_width)
                 for p in screen_points:
-                    pygame.draw.circle(self.screen, self.ROAD_COLOR, p, scaled_width / 2)
+                    pygame.draw.circle(self._map_surface, self.ROAD_COLOR, p, scaled_width / 2)
+        # --- ADDED: Draw sites ---
+        site_radius = int(10 * self.zoom)
+        for data, pos in zip(self.sites.values(), self.site_screen_positions()):
+            color = self.DUMP_COLOR if data['type'] == 'dump_site' else self.COAL_COLOR
+            pygame.draw.rect(self._map_surface, color, (pos[0]-site_radius, pos[1]-site_radius, site_radius*2, site_radius*2))
+
+    def visible_edge_mask(self):
+        """Tests every edge's bounding box against the world-space viewport in one NumPy op."""
+        (vx0, vy1), (vx1, vy0) = self.screen_to_world((0, 0)), self.screen_to_world((self.width, self.height))
+        margin = self.edge_widths # Roads are drawn this wide, so keep ones just outside the view
+        bbox = self.edge_bbox
+        return (bbox[:, 0] - margin <= vx1) & (bbox[:, 2] + margin >= vx0) & (bbox[:, 1] - margin <= vy1) & (bbox[:, 3] + margin >= vy0)
+
+    def site_screen_positions(self):
+        return self.world_to_screen(self.site_pos).tolist()
+
+    def draw(self):
+        cam_key = (self.zoom, self.offset[0], self.offset[1], self.width, self.height)
+        if self._map_dirty or cam_key != self._map_cam_key:
+            self.render_map()
+            self._map_cam_key, self._map_dirty = cam_key, False
+        self.screen.blit(self._map_surface, (0, 0))
         # Draw new road preview
         if self.tool == "draw" and len(self.new_road_points) > 1:
             scaled_width = int(self.DEFAULT_ROAD_WIDTH * self.zoom); scaled_width = max(2, scaled_width)
-            screen_points = [self.world_to_screen(p) for p in self.new_road_points]
+            screen_points = self.world_to_screen(np.asarray(self.new_road_points)).astype(np.int32).tolist()
             pygame.draw.lines(self.screen, (0,150,0), False, screen_points, scaled_width)
-        # --- ADDED: Draw sites and warnings ---
-        site_radius = int(10 * self.zoom)
-        for site_id, data in self.sites.items():
-            color = self.DUMP_COLOR if data['type'] == 'dump_site' else self.COAL_COLOR
-            pos = self.world_to_screen(data['pos'])
-            pygame.draw.rect(self.screen, color, (pos[0]-site_radius, pos[1]-site_radius, site_radius*2, site_radius*2))
-            # Flash a warning border if unconnected
-            if site_id in self.unreachable_sites and (self.warning_flash_timer % 60 < 30):
-                warning_rect = pygame.Rect(pos[0]-site_radius-2, pos[1]-site_radius-2, site_radius*2+4, site_radius*2+4)
-                pygame.draw.rect(self.screen, self.WARNING_COLOR, warning_rect, 3)
+        # --- ADDED: Flash a warning border around unconnected sites ---
+        if self.unreachable_sites and (self.warning_flash_timer % 60 < 30):
+            site_radius = int(10 * self.zoom)
+            for site_id, pos in zip(self.sites, self.site_screen_positions()):
+                if site_id in self.unreachable_sites:
+                    warning_rect = pygame.Rect(pos[0]-site_radius-2, pos[1]-site_radius-2, site_radius*2+4, site_radius*2+4)
+                    pygame.draw.rect(self.screen, self.WARNING_COLOR, warning_rect, 3)
 
         # Draw eraser cursor
         if self.tool == "erase":
-            eraser_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            pygame.draw.circle(eraser_surface, self.ERASER_COLOR, pygame.mouse.get_pos(), self.ERASER_RADIUS)
-            self.screen.blit(eraser_surface, (0,0))
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            self.screen.blit(self._eraser_surface, (mouse_x - self.ERASER_RADIUS, mouse_y - self.ERASER_RADIUS))
 
         self.draw_ui()
         self.warning_flash_timer += 1
         pygame.display.flip()
 
     def run(self):
+        # Capped at 60 FPS so the editor idles between frames instead of busy-looping
+        # (pygame only honours vsync with SCALED/OPENGL, and SCALED would stretch the map on resize)
+        clock = pygame.time.Clock()
         running = True
         while running:
             running = self.handle_events()
             self.draw()
+            clock.tick(60)
         pygame.quit()
         sys.exit()
 
@@ -1,54 +1,42 @@
 import pygame
 import sys
 import numpy as np
-import json
-from collections import deque
+import orjson
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 def load_cleaned_map(filename="map_data_cleaned.json"):
     """Loads the clean, processed map data."""
     print(f"Loading cleaned map data from {filename}...")
     try:
-        with open(filename, 'r') as f: map_data = json.load(f)
+        with open(filename, 'rb') as f: map_data = orjson.loads(f.read())
     except FileNotFoundError:
         print(f"❌ FATAL ERROR: The file '{filename}' was not found."); return None, None, None
 
-    junctions = {jid: {'pos': np.array(data['pos'])} for jid, data in map_data.get('junctions', {}).items()}
-    edges = map_data.get('edges', [])
-    sites = {sid: {'type': data['type'], 'pos': np.array(data['pos'])} for sid, data in map_data.get('sites', {}).items()}
+    junctions = {jid: {'pos': np.array(data['pos'], dtype=np.float32)} for jid, data in map_data.get('junctions', {}).items()}
+    edges = [{**edge, 'shape': np.asarray(edge['shape'], dtype=np.float32).reshape(-1, 2)} for edge in map_data.get('edges', [])]
+    sites = {sid: {'type': data['type'], 'pos': np.array(data['pos'], dtype=np.float32)} for sid, data in map_data.get('sites', {}).items()}
     return junctions, edges, sites
 
 def analyze_connectivity(junctions, edges):
     """Analyzes the road network and assigns a color to each disconnected component."""
     if not junctions: return {}
 
-    graph = {jid: [] for jid in junctions}
-    for edge in edges:
-        graph[edge['from']].append(edge['to'])
-        graph[edge['to']].append(edge['from'])
+    # Integer index per junction, then one sparse adjacency matrix for the whole network
+    junction_ids = list(junctions)
+    index_of = {jid: i for i, jid in enumerate(junction_ids)}
+    rows = np.array([index_of[edge['from']] for edge in edges], dtype=np.int32)
+    cols = np.array([index_of[edge['to']] for edge in edges], dtype=np.int32)
+    adjacency = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(junction_ids), len(junction_ids))).tocsr()
+    # Components are labelled in order of their first junction, matching the order colors are handed out in
+    component_id, labels = connected_components(adjacency, directed=False)
 
-    visited = set()
-    component_colors = {}
-    component_id = 0
     colors = [(34, 139, 34), (0, 0, 205), (255, 140, 0), (220, 20, 60), (148, 0, 211)] # Green, Blue, Orange, Red, Violet
 
     print("\n--- Network Connectivity Analysis ---")
-    for jid in junctions:
-        if jid not in visited:
-            component_id += 1
-            color = colors[(component_id - 1) % len(colors)]
-            print(f"Found network component #{component_id} (Color: {color})")
-
-            queue = deque([jid])
-            visited.add(jid)
-            component_colors[jid] = color
-
-            while queue:
-                node = queue.popleft()
-                for neighbor in graph.get(node, []):
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        component_colors[neighbor] = color
-                        queue.append(neighbor)
+    for label in range(component_id):
+        print(f"Found network component #{label + 1} (Color: {colors[label % len(colors)]})")
+    component_colors = {jid: colors[label % len(colors)] for jid, label in zip(junction_ids, labels.tolist())}
 
     if component_id == 1:
         print("✅ Good News! Your entire road network is fully connected.")
@@ -69,6 +57,13 @@ class MapDebugger:
         self.BG_COLOR, self.ROAD_COLOR = (240, 240, 240), (100, 100, 100)
         self.DUMP_COLOR, self.COAL_COLOR = (80, 80, 90), (139, 69, 19)
         self.zoom, self.offset = 1.0, np.array([0.0, 0.0])
+        # All edge points stacked once (edge i owns the next edge_lengths[i] rows), transformed together in draw
+        shapes = [edge['shape'] for edge in edges]
+        self.edge_points = np.concatenate(shapes) if shapes else np.empty((0, 2), dtype=np.float32)
+        self.edge_lengths = np.array([len(shape) for shape in shapes], dtype=int)
+        # Per-edge world-space bounding boxes (min_x, min_y, max_x, max_y) for off-screen culling
+        self.edge_bbox = np.array([np.concatenate([shape.min(axis=0), shape.max(axis=0)]) if len(shape) else [np.inf, np.inf, -np.inf, -np.inf]
+                                   for shape in shapes], dtype=np.float32).reshape(-1, 4)
         self.center_map()
 
     def center_map(self):
@@ -76,27 +71,43 @@ class MapDebugger:
         min_coords, max_coords = np.min(all_points, axis=0), np.max(all_points, axis=0)
         map_center = (min_coords + max_coords) / 2.0; map_size = np.where(max_coords - min_coords == 0, 1, max_coords - min_coords)
         zoom_x = self.width / map_size[0] * 0.9; zoom_y = self.height / map_size[1] * 0.9
-        self.zoom = min(zoom_x, zoom_y)
+        self.zoom = float(min(zoom_x, zoom_y))
         self.offset = np.array([self.width / 2.0, self.height / 2.0]) - map_center * self.zoom
 
     def world_to_screen(self, world_pos):
-        return (np.array([world_pos[0], -world_pos[1]]) * self.zoom + self.offset).astype(int)
+        """Transforms a single (2,) point or a whole (N, 2) array of points to integer pixels."""
+        scale = np.array([self.zoom, -self.zoom], dtype=np.float32)
+        return (np.asarray(world_pos, dtype=np.float32) * scale + self.offset.astype(np.float32)).astype(np.int32)
+
+    def point_to_screen(self, x, y):
+        """Scalar version of world_to_screen for single points; plain ints avoid NumPy's per-call overhead."""
+        return int(x * self.zoom + self.offset[0]), int(self.offset[1] - y * self.zoom)
+
+    def visible_edge_mask(self):
+        """Tests every edge's bounding box against the world-space viewport in one NumPy op."""
+        vx0, vx1 = -self.offset[0] / self.zoom, (self.width - self.offset[0]) / self.zoom
+        vy0, vy1 = (self.offset[1] - self.height) / self.zoom, self.offset[1] / self.zoom
+        bbox = self.edge_bbox
+        return (bbox[:, 0] <= vx1) & (bbox[:, 2] >= vx0) & (bbox[:, 1] <= vy1) & (bbox[:, 3] >= vy0)
 
     def draw(self):
         self.screen.fill(self.BG_COLOR)
-        for edge in self.edges:
-            if len(edge['shape']) > 1:
-                screen_points = [self.world_to_screen(np.array(p)) for p in edge['shape']]
-                pygame.draw.lines(self.screen, self.ROAD_COLOR, False, screen_points, 3)
+        # Points of the visible edges are transformed in one pass, then split back per edge
+        edge_mask = self.visible_edge_mask()
+        visible = np.flatnonzero(edge_mask)
+        all_screen_points = self.world_to_screen(self.edge_points[np.repeat(edge_mask, self.edge_lengths)])
+        for screen_points in np.split(all_screen_points, np.cumsum(self.edge_lengths[visible])[:-1]):
+            if len(screen_points) > 1:
+                pygame.draw.lines(self.screen, self.ROAD_COLOR, False, screen_points.tolist(), 3)
 
         for jid, jdata in self.junctions.items():
             color = self.component_colors.get(jid, (0,0,0)) # Black if something is wrong
-            pygame.draw.circle(self.screen, color, self.world_to_screen(jdata['pos']), 8)
+            pygame.draw.circle(self.screen, color, self.point_to_screen(*jdata['pos'].tolist()), 8)
 
         site_radius = int(10 * self.zoom)
         for data in self.sites.values():
             color = self.DUMP_COLOR if data['type'] == 'dump_site' else self.COAL_COLOR
-            pos = self.world_to_screen(data['pos'])
+            pos = self.point_to_screen(*data['pos'].tolist())
             pygame.draw.rect(self.screen, color, (pos[0]-site_radius, pos[1]-site_radius, site_radius*2, site_radius*2))
 
         pygame.display.flip()
@@ -1,5 +1,7 @@
 import math
 import sys
+import functools
+import numpy as np
 import pygame
 
 # -----------------------------
@@ -21,6 +23,11 @@ CRR             = 0.006
 AIR_DENS        = 1.225
 MU_TIRE         = 0.8
 
+# Force terms that depend only on the constants above, computed once
+F_ROLL          = CRR * MASS_KG * 9.81              # rolling resistance, N
+K_DRAG          = 0.5 * AIR_DENS * CD * FRONTAL_AREA  # aero drag = K_DRAG * v^2, N
+F_MU            = MU_TIRE * MASS_KG * 9.81          # tire grip limit, N
+
 P_MAX_W         = 300_000.0
 A_BRAKE_COMF    = 3.0
 A_BRAKE_MAX     = 4.5
@@ -43,6 +50,11 @@ screen = pygame.display.set_mode((WIN_W, WIN_H))
 clock  = pygame.time.Clock()
 font   = pygame.font.SysFont("consolas", 18)
 
+@functools.lru_cache(maxsize=256)
+def render_text(text, color):
+    # HUD labels repeat frame to frame (cruise speed, idle zoom), so reuse their surfaces
+    return font.render(text, True, color)
+
 GREY    = (85, 85, 85)
 DARK    = (30, 30, 30)
 WHITE   = (240, 240, 240)
@@ -68,15 +80,12 @@ PAN_SPEED_FAST = 200.0
 ZOOM_STEP = 1.1
 
 def resist_forces(v_ms):
-    F_rr = CRR * MASS_KG * 9.81
-    F_d  = 0.5 * AIR_DENS * CD * FRONTAL_AREA * v_ms * v_ms
-    return F_rr + F_d
+    return F_ROLL + K_DRAG * v_ms * v_ms
 
 def traction_force_from_power(v_ms, throttle):
     v_eff = max(v_ms, 0.5)
     F_power = (P_MAX_W * max(0.0, min(1.0, throttle))) / v_eff
-    F_mu = MU_TIRE * MASS_KG * 9.81
-    return min(F_power, F_mu)
+    return min(F_power, F_MU)
 
 def brake_force_from_command(brake_cmd):
     brake_cmd = max(0.0, min(1.0, brake_cmd))
@@ -87,8 +96,7 @@ def stopping_distance(v_ms, a_dec):
         return float('inf')
     return v_ms * v_ms / (2.0 * a_dec)
 
-def controller(dt, s, v, remaining_m):
-    global int_err
+def controller(dt, s, v, remaining_m, int_err):
     margin = 20.0
     need_brake_for_end = remaining_m < (stopping_distance(v, A_BRAKE_COMF) + margin)
     v_ref = TARGET_MS if not need_brake_for_end else 0.0
@@ -101,18 +109,40 @@ def controller(dt, s, v, remaining_m):
     brake    = 0.0
     if a_des >= 0.0:
         F_need = MASS_KG * a_des + F_res
-        lo, hi = 0.0, 1.0
-        for _ in range(12):
-            mid = 0.5 * (lo + hi)
-            if traction_force_from_power(v, mid) >= F_need:
-                hi = mid
-            else:
-                lo = mid
-        throttle = hi
+        # Power-limited traction is linear in throttle, so solve for it directly
+        v_eff = max(v, 0.5)
+        throttle = min(1.0, max(0.0, F_need * v_eff / P_MAX_W))
+        if P_MAX_W * throttle / v_eff > F_MU:
+            throttle = F_MU * v_eff / P_MAX_W  # More throttle would only spin the tires
     else:
         F_need_brake = max(0.0, MASS_KG * (-a_des) - F_res)
         brake = min(1.0, F_need_brake / (MASS_KG * A_BRAKE_MAX))
-    return throttle, brake
+    return throttle, brake, int_err
+
+def physics_step(dt, s, v, int_err):
+    # One tick of controller + forces + Euler integration, kept free of globals
+    remaining = max(0.0, ROAD_LEN_M - s)
+    if AUTO_MODE:
+        throttle, brake, int_err = controller(dt, s, v, remaining, int_err)
+    else:
+        throttle = 0.0
+        brake    = 0.0
+
+    F_res   = resist_forces(v)
+    F_trac  = traction_force_from_power(v, throttle)
+    F_brake = brake_force_from_command(brake)
+
+    F_net = F_trac - F_res - F_brake
+    a = F_net / MASS_KG
+
+    v = max(0.0, v + a * dt)
+    v = min(v, TARGET_MS)
+    s = s + v * dt
+    if s >= ROAD_LEN_M:
+        s = ROAD_LEN_M
+        v = 0.0
+        a = 0.0
+    return s, v, a, int_err
 
 def scale_px_per_m():
     return BASE_SCALE * zoom
@@ -161,23 +191,35 @@ def draw_lane_markings():
     pygame.draw.line(screen, WHITE, (xls, yts), (xls, ybs), max(1, int(2 * zoom)))
     pygame.draw.line(screen, WHITE, (xrs, yts), (xrs, ybs), max(1, int(2 * zoom)))
 
-    dash_m = 10.0
-    gap_m  = 10.0
     for li in range(1, LANES):
         x_m = li * LANE_WIDTH_M
         xs, _ = world_to_screen(x_m, 0.0)
-        _, y_world_top = screen_to_world(0, 0)
-        _, y_world_bot = screen_to_world(0, WIN_H)
-        y_min = max(0.0, min(y_world_top, y_world_bot))
-        y_max = min(ROAD_LEN_M, max(y_world_top, y_world_bot))
-        start = y_min - ((y_min) % (dash_m + gap_m))
-        y = start
-        while y < y_max:
-            y2 = min(y + dash_m, y_max)
-            _, ys1 = world_to_screen(0.0, y)
-            _, ys2 = world_to_screen(0.0, y2)
+        for ys1, ys2 in visible_dash_spans():
             pygame.draw.line(screen, LINE, (xs, ys1), (xs, ys2), max(1, int(2 * zoom)))
-            y += dash_m + gap_m  # FIXED: removed stray parenthesis
+
+_dash_key = None
+_dash_spans = []
+
+def visible_dash_spans():
+    # Screen-space (y_start, y_end) of every visible lane dash; shared by all lanes and
+    # recomputed only when the camera's zoom or vertical position changes
+    global _dash_key, _dash_spans
+    key = (zoom, cam_cy)
+    if key == _dash_key:
+        return _dash_spans
+    dash_m = 10.0
+    gap_m  = 10.0
+    _, y_world_top = screen_to_world(0, 0)
+    _, y_world_bot = screen_to_world(0, WIN_H)
+    y_min = max(0.0, min(y_world_top, y_world_bot))
+    y_max = min(ROAD_LEN_M, max(y_world_top, y_world_bot))
+    start = y_min - ((y_min) % (dash_m + gap_m))
+    y1 = np.arange(start, y_max, dash_m + gap_m)
+    y2 = np.minimum(y1 + dash_m, y_max)
+    ends_m = np.stack([y1, y2], axis=1)
+    _dash_spans = (WIN_H * 0.5 + (cam_cy - ends_m) * scale_px_per_m()).astype(int).tolist()
+    _dash_key = key
+    return _dash_spans
 
 def draw_truck(s):
     x_center = (LANES * LANE_WIDTH_M) * 0.5
@@ -189,17 +231,15 @@ def draw_truck(s):
     rect = pygame.Rect(xs - truck_w_px // 2, ys - truck_h_px // 2, truck_w_px, truck_h_px)
     pygame.draw.rect(screen, RED, rect, border_radius=3)
 
+# "Nice" scale-bar lengths in meters: 1, 2, 5 x 10^n
+SCALE_BAR_CANDIDATES = [k * (10 ** n) for n in range(-3, 6) for k in (1, 2, 5)]
+
 def draw_scale_bar():
     S = scale_px_per_m()
-    nice = [1,2,5]
     target_px = 220
-    candidates = []
-    for n in range(-3, 6):
-        for k in nice:
-            candidates.append(k * (10 ** n))
-    best = candidates[0]
+    best = SCALE_BAR_CANDIDATES[0]
     best_err = abs(best * S - target_px)
-    for c in candidates:
+    for c in SCALE_BAR_CANDIDATES:
         err = abs(c * S - target_px)
         if err < best_err:
             best = c
@@ -219,14 +259,14 @@ def draw_scale_bar():
         xi = x0 + int(i * sub_m * S)
         pygame.draw.line(screen, WHITE, (xi, y0 - 5), (xi, y0 + 5), 1)
     label = f"{length_m:g} m   |   zoom {zoom:.2f}x   |   {S:.1f} px/m"
-    text = font.render(label, True, WHITE)
+    text = render_text(label, WHITE)
     screen.blit(text, (x0, y0 + 10))
 
 def draw_hud():
     kmh = ms_to_kmh(v)
-    text1 = font.render(f"Speed: {kmh:6.1f} km/h   Accel: {a:5.2f} m/s^2", True, WHITE)
-    text2 = font.render(f"Distance: {s:7.1f} m / {ROAD_LEN_M:.0f} m", True, WHITE)
-    text3 = font.render("Controls: Wheel zoom, Right-drag pan, Arrows/WASD pan, +/- zoom, C follow, R reset", True, GREEN)
+    text1 = render_text(f"Speed: {kmh:6.1f} km/h   Accel: {a:5.2f} m/s^2", WHITE)
+    text2 = render_text(f"Distance: {s:7.1f} m / {ROAD_LEN_M:.0f} m", WHITE)
+    text3 = render_text("Controls: Wheel zoom, Right-drag pan, Arrows/WASD pan, +/- zoom, C follow, R reset", GREEN)
     screen.blit(text1, (16, 12))
     screen.blit(text2, (16, 36))
     screen.blit(text3, (16, 60))
@@ -293,27 +333,7 @@ def main():
             cam_cx = (LANES * LANE_WIDTH_M) * 0.5
             cam_cy = s - (WIN_H * 0.3) / scale_px_per_m()
 
-        remaining = max(0.0, ROAD_LEN_M - s)
-        if AUTO_MODE:
-            throttle, brake = controller(dt, s, v, remaining)
-        else:
-            throttle = 0.0
-            brake    = 0.0
-
-        F_res   = resist_forces(v)
-        F_trac  = traction_force_from_power(v, throttle)
-        F_brake = brake_force_from_command(brake)
-
-        F_net = F_trac - F_res - F_brake
-        a = F_net / MASS_KG
-
-        v = max(0.0, v + a * dt)
-        v = min(v, TARGET_MS)
-        s = s + v * dt
-        if s >= ROAD_LEN_M:
-            s = ROAD_LEN_M
-            v = 0.0
-            a = 0.0
+        s, v, a, int_err = physics_step(dt, s, v, int_err)
 
         screen.fill(DARK)
         draw_lane_markings()
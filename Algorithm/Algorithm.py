@@ -1,46 +1,64 @@
-import csv
-from collections import defaultdict
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+from collections import defaultdict, deque
 import heapq
+from bisect import bisect_right
+import sys
 import itertools
-import copy
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 # Load/unload time in seconds (can be changed for testing)
 LOAD_UNLOAD_TIME = 1
-
-# Read edges from CSV
-edges = []
-with open('edges.csv', 'r') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        edges.append((row['source'], row['destination'], int(row['distance'])))
-
-# Build graph
-G = nx.Graph()
-for src, dst, dist in edges:
-    G.add_edge(src, dst, weight=dist)
-
-# Draw graph
-# Use edge distances to influence layout
-edge_lengths = {(src, dst): dist for src, dst, dist in edges}
-
-# Kamada-Kawai layout uses edge weights as distances
-G_for_layout = nx.Graph()
-for src, dst, dist in edges:
-    G_for_layout.add_edge(src, dst, weight=dist)
-
-pos = nx.kamada_kawai_layout(G_for_layout, weight='weight')
-plt.figure(figsize=(8,6))
-nx.draw(G, pos, with_labels=True, node_color='lightblue', node_size=1200, font_size=12, font_weight='bold', edge_color='gray')
-labels = nx.get_edge_attributes(G, 'weight')
-nx.draw_networkx_edge_labels(G, pos, edge_labels=labels)
-plt.title("Coal Mine Network Map (Edge Lengths = Distances)")
-# Save the graph as an image instead of displaying it
-plt.savefig("map.png")
-# plt.show()  # Commented out to avoid display issues
+# How much coal (kg) one truck carries per trip
+TRUCK_CAPACITY = 50
+# DP states with at least this many trips whose visiting order is still unknown work them out in parallel
+PARALLEL_MIN_TRIPS = 512
+# Most DP states a solve keeps at once; past this the oldest are forgotten and recomputed if met again
+MAX_MEMO_ENTRIES = 2_000_000
+
+def read_csv_columns(filename):
+    """Parses a headed CSV in one vectorized pass into a structured array (one typed column per header)."""
+    return np.atleast_1d(np.genfromtxt(filename, delimiter=',', names=True, dtype=None, encoding='utf-8'))
+
+def read_edges(filename='edges.csv'):
+    """Reads (source, destination, distance) road segments from CSV."""
+    table = read_csv_columns(filename)
+    return list(zip(table['source'].tolist(), table['destination'].tolist(), table['distance'].astype(int).tolist()))
+
+def draw_network(edges, filename="map.png"):
+    """Draws the road network (edge lengths = distances) and saves it as an image."""
+    # matplotlib and networkx are only imported when a map is actually drawn
+    import matplotlib.pyplot as plt
+    import networkx as nx
+    # Build graph
+    G = nx.Graph()
+    for src, dst, dist in edges:
+        G.add_edge(src, dst, weight=dist)
+
+    # Kamada-Kawai layout uses edge weights as distances
+    pos = nx.kamada_kawai_layout(G, weight='weight')
+    plt.figure(figsize=(8,6))
+    # Plain matplotlib calls on the layout coordinates instead of nx.draw's per-artist bookkeeping
+    for src, dst, dist in edges:
+        (x1, y1), (x2, y2) = pos[src], pos[dst]
+        plt.plot([x1, x2], [y1, y2], color='gray', zorder=1)
+        plt.annotate(str(dist), ((x1 + x2) / 2, (y1 + y2) / 2), ha='center', va='center',
+                     bbox=dict(boxstyle='round', fc='white', ec='white'), zorder=3)
+    xs, ys = zip(*pos.values())
+    plt.scatter(xs, ys, s=1200, c='lightblue', zorder=2)
+    for node, (x, y) in pos.items():
+        plt.text(x, y, node, fontsize=12, fontweight='bold', ha='center', va='center', zorder=4)
+    plt.axis('off')
+    plt.title("Coal Mine Network Map (Edge Lengths = Distances)")
+    # Save the graph as an image instead of displaying it
+    plt.savefig(filename)
+    # plt.show()  # Commented out to avoid display issues
 
 class Truck:
+    __slots__ = ('truck_id', 'capacity', 'location', 'loaded', 'total_time', 'route')
+
     def __init__(self, truck_id, capacity, location):
         self.truck_id = truck_id
         self.capacity = capacity
@@ -52,176 +70,408 @@ class Truck:
     def __str__(self):
         return f"Truck {self.truck_id}: Location={self.location}, Capacity={self.capacity}kg, Loaded={self.loaded}kg, Total Time={self.total_time}s"
 
-# Read node capacities
-node_capacities = {}
-with open('nodes.csv', 'r') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        node_capacities[row['source']] = int(row['source_capacity'])
-
-# Dijkstra's algorithm for shortest path (fastest path since 1km=1s)
-def dijkstra(graph, start, end):
-    queue = [(0, start, [])]
-    visited = set()
-    while queue:
-        (cost, node, path) = heapq.heappop(queue)
-        if node in visited:
-            continue
-        visited.add(node)
-        path = path + [node]
-        if node == end:
-            return (cost, path)
-        for neighbor in graph[node]:
-            if neighbor[0] not in visited:
-                heapq.heappush(queue, (cost + neighbor[1], neighbor[0], path))
-    return (float('inf'), [])
+def read_node_capacities(filename='nodes.csv'):
+    """Reads how much coal each node holds from CSV."""
+    table = read_csv_columns(filename)
+    return dict(zip(table['source'].tolist(), table['source_capacity'].astype(int).tolist()))
+
+# Shortest paths (fastest path since 1km=1s)
+def index_graph(graph, nodes=()):
+    """Numbers the nodes 0..n-1 so the roads can be laid out as a CSR matrix.
+    Returns (names, ids, csr) where csr = (indptr, indices, weights): the roads leaving node i are
+    indices[indptr[i]:indptr[i+1]] with lengths weights[indptr[i]:indptr[i+1]]."""
+    names = list(dict.fromkeys([*graph, *nodes]))
+    ids = {name: i for i, name in enumerate(names)}
+    indptr, indices, weights = [0], [], []
+    for name in names:
+        for dst, dist in graph.get(name, []):
+            indices.append(ids[dst])
+            weights.append(dist)
+        indptr.append(len(indices))
+    return names, ids, (indptr, indices, weights)
+
+def path_from_tree(dist, prev, names, start, end):
+    """Walks the predecessor links back from end; returns (cost, path of node names)."""
+    if dist[end] == float('inf'):
+        return (float('inf'), [])
+    path = [end]
+    while path[-1] != start:
+        path.append(prev[path[-1]])
+    return (dist[end], [names[i] for i in reversed(path)])
+
+def all_pairs_shortest_paths(graph, nodes):
+    """Shortest (cost, path) between every pair of the given nodes, as {(start, end): (cost, path)}.
+    The road network never changes, so the DP and the simulations look paths up here instead.
+    All the searches run in one scipy.sparse.csgraph.dijkstra call over a CSR matrix of the roads."""
+    names, ids, (indptr, indices, weights) = index_graph(graph, nodes)
+    # A CSR matrix sums repeated entries, so parallel roads are reduced to the shortest one first
+    shortest = {}
+    for u in range(len(names)):
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if (u, v) not in shortest or weights[k] < shortest[(u, v)]:
+                shortest[(u, v)] = weights[k]
+    rows, cols = zip(*shortest) if shortest else ((), ())
+    roads = csr_matrix((list(shortest.values()), (rows, cols)), shape=(len(names), len(names)))
+    starts = [ids[a] for a in nodes]
+    # csgraph works in floats; whole-number road lengths are given back as ints, as the DP adds them up
+    whole_lengths = all(isinstance(w, int) for w in weights)
+    dist, prev = csgraph_dijkstra(roads, directed=True, indices=starts, return_predecessors=True)
+    paths = {}
+    for row, a in enumerate(nodes):
+        dist_row, prev_row = dist[row].tolist(), prev[row].tolist()
+        # csgraph marks "no predecessor" with -9999
+        prev_row = [p if p >= 0 else -1 for p in prev_row]
+        for b in nodes:
+            cost, path = path_from_tree(dist_row, prev_row, names, ids[a], ids[b])
+            paths[(a, b)] = (int(cost) if whole_lengths and cost != float('inf') else cost, path)
+    return paths
 
 # Build adjacency list for Dijkstra
-adjacency = defaultdict(list)
-for src, dst, dist in edges:
-    adjacency[src].append((dst, dist))
-    adjacency[dst].append((src, dist))
-
-# Initialize truck
-truck = Truck(truck_id=1, capacity=50, location='Dump_site')
-
-def dp_min_time_multi_truck(node_capacities, truck_capacity, adjacency, dump_site, num_trucks=3):
+def build_adjacency(edges):
+    adjacency = defaultdict(list)
+    for src, dst, dist in edges:
+        adjacency[src].append((dst, dist))
+        adjacency[dst].append((src, dist))
+    return adjacency
+
+def fastest_order(paths, start, stops, end):
+    """Held-Karp, run backwards from end: (travel time, order) for the fastest way to visit stops when
+    starting at start and finishing at end, with the order as positions into stops. O(r^2 * 2^r) instead of trying all r! orders;
+    on ties the lowest position wins at every step, which gives the same order a permutation search
+    in itertools order would pick."""
+    n = len(stops)
+    # Travel times between the stops as a small matrix indexed by position, read once from the
+    # (name, name)-keyed table so the subset loops below only do list indexing and integer adds
+    between = [[paths[(a, b)][0] for b in stops] for a in stops]
+    to_end = [paths[(a, end)][0] for a in stops]
+    from_start = [paths[(start, b)][0] for b in stops]
+    # rest[mask][first] is the fastest way to start at stops[first], visit the other stops picked
+    # out by mask and finish at end
+    inf = float('inf')
+    rest = [[inf] * n for _ in range(1 << n)]
+    next_stop = [[-1] * n for _ in range(1 << n)]
+    for first in range(n):
+        rest[1 << first][first] = to_end[first]
+    # members[mask] lists the positions in mask in increasing order (its lowest bit, then the rest),
+    # so the loops below only visit stops that are in the subset instead of testing all n bits
+    members = [[]]
+    for mask in range(1, 1 << n):
+        low_bit = mask & -mask
+        members.append([low_bit.bit_length() - 1] + members[mask ^ low_bit])
+    for mask in range(1, 1 << n):
+        in_mask = members[mask]
+        if len(in_mask) == 1:
+            continue
+        mask_rest, mask_next = rest[mask], next_stop[mask]
+        for first in in_mask:
+            rest_mask = mask ^ (1 << first)
+            rest_times, times_from_first = rest[rest_mask], between[first]
+            best, best_next = inf, -1
+            for nxt in members[rest_mask]:
+                t = times_from_first[nxt] + rest_times[nxt]
+                if t < best:
+                    best, best_next = t, nxt
+            mask_rest[first], mask_next[first] = best, best_next
+
+    # Pick the fastest first stop from start, then follow the next_stop links
+    mask = (1 << n) - 1
+    first = min(range(n), key=lambda j: from_start[j] + rest[mask][j])
+    travel_time = from_start[first] + rest[mask][first]
+    order = []
+    while first != -1:
+        order.append(first)
+        mask, first = mask ^ (1 << first), next_stop[mask][first]
+    return travel_time, tuple(order)
+
+# Shortest-path table for worker processes, sent once per worker by the pool initializer
+# instead of being pickled along with every task
+_worker_trip_table = None
+
+def share_trip_table(paths, mines, dump_site):
+    global _worker_trip_table
+    _worker_trip_table = (paths, mines, dump_site)
+
+def fastest_order_worker(task):
+    start, combo = task
+    paths, mines, dump_site = _worker_trip_table
+    return fastest_order(paths, start, [mines[i] for i in combo], dump_site)
+
+@lru_cache(maxsize=None)
+def subsets_in_combination_order(n):
+    """Every non-empty subset of range(n) as (bitmask, positions), in itertools.combinations order by size."""
+    return [(sum(1 << p for p in positions), positions) for r in range(1, n + 1) for positions in itertools.combinations(range(n), r)]
+
+def dp_min_time_multi_truck(node_capacities, truck_capacity, adjacency, dump_site, num_trucks=3, paths=None):
     mines = [node for node in node_capacities if node != dump_site]
     initial_state = tuple(node_capacities[mine] for mine in mines)
+    # Callers that also replay the solution pass in their own table so it is only built once
+    if paths is None:
+        paths = all_pairs_shortest_paths(adjacency, node_capacities)
 
     memo = {}
-    choice = {}
-
-    def dp(state, truck_times, truck_locations):
-        key = (state, truck_times, truck_locations)
-
-        if key in memo:
-            return memo[key]
-
-        # Base case: all mines depleted
-        if all(coal == 0 for coal in state):
-            # All trucks return to dump site if not already there
-            max_return_time = 0
-            for i, location in enumerate(truck_locations):
-                if location != dump_site:
-                    t, _ = dijkstra(adjacency, location, dump_site)
-                    max_return_time = max(max_return_time, truck_times[i] + t)
-                else:
-                    max_return_time = max(max_return_time, truck_times[i])
-
-            memo[key] = max_return_time
-            choice[key] = None
-            return max_return_time
-
-        min_makespan = float('inf')
-        best_assignment = None
+    # memo is bounded: past MAX_MEMO_ENTRIES the oldest exact value is dropped and recomputed if needed
+    memo_order = deque()
+
+    def remember(memo_key, makespan):
+        memo[memo_key] = makespan
+        memo_order.append(memo_key)
+        if len(memo) > MAX_MEMO_ENTRIES:
+            del memo[memo_order.popleft()]
+
+    # memo key: (bit-packed per-mine coal, sorted truck times)
+    state_bits = max(max(initial_state, default=0), 1).bit_length()
+    coal_mask = (1 << state_bits) - 1
+
+    def pack(values, bits):
+        return sum(value << (bits * i) for i, value in enumerate(values))
+
+    # A trip that fits in the truck empties every mine it visits, whatever the visiting order,
+    # so all orders of one mine subset lead to the same next state. Only the fastest order can
+    # be optimal (finishing a trip later never helps), so each subset is collapsed to that order.
+    # The same subset recurs in every DP state that still has those mines active, so its
+    # (order, mine names in order, route, trip time) is stored in best_trips the first time the DP meets it.
+    best_trips = {}
+
+    def remember_trip(combo, travel_time, positions):
+        # Trip: dump_site -> mines -> dump_site, travel time as found by fastest_order
+        order = tuple(combo[p] for p in positions)
+        route = [dump_site]
+        route.extend(mines[i] for i in order)
+        route.append(dump_site)
+
+        # Add load/unload times
+        trip_time = travel_time
+        trip_time += LOAD_UNLOAD_TIME * len(order)  # Loading at each mine
+        trip_time += LOAD_UNLOAD_TIME  # Unloading at dump site
+        best_trips[combo] = (order, [mines[i] for i in order], route, trip_time)
+
+    def best_trip(combo):
+        if combo not in best_trips:
+            remember_trip(combo, *fastest_order(paths, dump_site, [mines[i] for i in combo], dump_site))
+        return best_trips[combo]
+
+    # Worker processes for states with many unsolved subsets; started the first time one is needed
+    # and only used during the main solve (best_assignment's later solves stay serial, as nothing would shut them down)
+    pool = None
+    solving = True
+
+    # The trips that fit depend only on the coal left, not on the truck times, and the same coal
+    # code comes back with many different truck times, so each code's trips are worked out once
+    @lru_cache(maxsize=None)
+    def trips_from(state_code):
+        """Every (mine subset, next coal code, trip time) that fits from this coal code, in the order they are compared."""
+        nonlocal pool
+        # Mines with coal left (read out of the packed code); the same for every truck and trip size tried from this state
+        state = [(state_code >> (state_bits * i)) & coal_mask for i in range(len(mines))]
+        active_mines = [i for i, coal in enumerate(state) if coal > 0]
+
+        # Which mine subsets fit in the truck depends only on the state, so they are found once here.
+        # subset_load[mask] is the coal a trip over the active mines in mask would pick up, built
+        # from the same subset minus its lowest mine, so each capacity check is one table lookup.
+        # A trip that fits picks up all of that coal, so subset_taken[mask] (the same coal, shifted
+        # into place in the packed code) turns this state's code into the next one in one subtraction,
+        # worked out once per subset instead of once per truck.
+        capped = [min(state[i], truck_capacity) for i in active_mines]
+        shifted = [coal << (state_bits * i) for coal, i in zip(capped, active_mines)]
+        subset_load = [0] * (1 << len(active_mines))
+        subset_taken = [0] * (1 << len(active_mines))
+        for mask in range(1, len(subset_load)):
+            low_bit = mask & -mask
+            low = low_bit.bit_length() - 1
+            subset_load[mask] = subset_load[mask ^ low_bit] + capped[low]
+            subset_taken[mask] = subset_taken[mask ^ low_bit] + shifted[low]
+        feasible_trips = [
+            (tuple(active_mines[p] for p in positions), state_code - subset_taken[mask])
+            for mask, positions in subsets_in_combination_order(len(active_mines))
+            if subset_load[mask] <= truck_capacity
+        ]
+        # Smaller-than-possible trips are kept on purpose: two trucks each taking one half-load mine
+        # in parallel can finish sooner than one truck taking both, so pruning non-maximal trips (or
+        # trips that carry as much as a shorter one) could lose the optimal makespan. Splitting a trip
+        # in two never helps either, as a combined trip is never slower than its parts run back to back.
+
+        # Subset orders are independent of each other, so a large batch not yet in best_trips is
+        # handed out to worker processes, which only get the start and subset of each trip
+        todo = [(dump_site, combo) for combo, _ in feasible_trips if combo not in best_trips]
+        if solving and len(todo) >= PARALLEL_MIN_TRIPS:
+            if pool is None:
+                pool = ProcessPoolExecutor(initializer=share_trip_table, initargs=(paths, mines, dump_site))
+            for (_, combo), (travel_time, positions) in zip(todo, pool.map(fastest_order_worker, todo, chunksize=64)):
+                remember_trip(combo, travel_time, positions)
+
+        # Each subset is visited in its fastest order; its trip time is looked up once for all the trucks
+        return [(combo, new_state_code, best_trip(combo)[-1]) for combo, new_state_code in feasible_trips]
+
+    def next_trips(state_code, truck_times, trucks):
+        """Every (truck_id, mine subset, next coal code, next truck times) one more trip by one of
+        the given trucks can lead to, in the order they are compared."""
+        moves = []
+        trips = trips_from(state_code)
 
         # Try assigning next trip to each available truck
-        for truck_id in range(num_trucks):
+        for truck_id in trucks:
             current_truck_time = truck_times[truck_id]
-            current_location = truck_locations[truck_id]
 
             # Try all possible trips for this truck
-            for r in range(1, len(mines)+1):
-                active_mines = [i for i, coal in enumerate(state) if coal > 0]
-                if r > len(active_mines):
+            for combo, new_state_code, trip_time in trips:
+                # Update truck times
+                new_truck_times = list(truck_times)
+                new_truck_times[truck_id] = current_truck_time + trip_time
+                moves.append((truck_id, combo, new_state_code, new_truck_times))
+        return moves
+
+    # Lower bounds for branch-and-bound. A trip to mine m takes at least the round trip to it plus
+    # loading and unloading, whatever else it visits.
+    round_trip = [paths[(dump_site, mine)][0] + paths[(mine, dump_site)][0] + 2 * LOAD_UNLOAD_TIME for mine in mines]
+    coal_bounds = {}
+
+    def lower_bound(memo_key):
+        """A makespan no schedule from this state can beat: no truck's time ever goes down, the
+        farthest mine left still needs a round trip by the first free truck, and the trips left
+        (at least the coal over the capacity, each at least the nearest round trip) are shared
+        by all the trucks at best evenly."""
+        state_code, truck_times = memo_key
+        if state_code not in coal_bounds:
+            coal = [(state_code >> (state_bits * i)) & coal_mask for i in range(len(mines))]
+            active_trips = [round_trip[i] for i, c in enumerate(coal) if c > 0]
+            if not active_trips:
+                coal_bounds[state_code] = (0, 0)
+            else:
+                trips_left = -(-sum(coal) // truck_capacity)
+                coal_bounds[state_code] = (max(active_trips), trips_left * min(active_trips))
+        farthest, work_left = coal_bounds[state_code]
+        return max(truck_times[-1], truck_times[0] + farthest, (sum(truck_times) + work_left) / num_trucks)
+
+    def dp(root):
+        # Explicit-stack DFS; frame = [memo key, next states, how many done, best makespan so far]
+        stack = [[root, None, 0, float('inf')]]
+        memo_get = memo.get
+        while stack:
+            frame = stack[-1]
+            memo_key, moves, done, best_makespan = frame
+            if moves is None:
+                state_code, truck_times = memo_key
+                if memo_key in memo:
+                    stack.pop()
                     continue
 
-                for combo in itertools.combinations(active_mines, r):
-                    # Check capacity constraint
-                    coal_to_pick = [min(state[i], truck_capacity) for i in combo]
-                    if sum(coal_to_pick) > truck_capacity:
-                        continue
+                # Base case: all mines depleted
+                if state_code == 0:
+                    remember(memo_key, max(truck_times))
+                    stack.pop()
+                    continue
 
-                    # Try all orders of visiting mines
-                    for order in itertools.permutations(combo):
-                        # Calculate trip time: current_location -> mines -> dump_site
-                        route = [current_location] + [mines[i] for i in order] + [dump_site]
-                        trip_time = 0
-
-                        for i in range(len(route)-1):
-                            t, _ = dijkstra(adjacency, route[i], route[i+1])
-                            trip_time += t
-
-                        # Add load/unload times
-                        trip_time += LOAD_UNLOAD_TIME * len(order)  # Loading at each mine
-                        trip_time += LOAD_UNLOAD_TIME  # Unloading at dump site
-
-                        # Update state
-                        new_state = list(state)
-                        remaining_capacity = truck_capacity
-                        for i in order:
-                            take = min(new_state[i], remaining_capacity)
-                            remaining_capacity -= take
-                            new_state[i] -= take
-
-                        # Update truck times and locations
-                        new_truck_times = list(truck_times)
-                        new_truck_locations = list(truck_locations)
-                        new_truck_times[truck_id] = current_truck_time + trip_time
-                        new_truck_locations[truck_id] = dump_site
-
-                        # Recurse
-                        makespan = dp(tuple(new_state), tuple(new_truck_times), tuple(new_truck_locations))
-
-                        if makespan < min_makespan:
-                            min_makespan = makespan
-                            best_assignment = (truck_id, order, [mines[i] for i in order], route, trip_time)
-
-        memo[key] = min_makespan
-        choice[key] = best_assignment
-        return min_makespan
+                # truck_times is sorted: only the first of several equally free trucks is tried
+                trips = trips_from(state_code)
+                moves = frame[1] = []
+                add_move = moves.append
+                for t in range(num_trucks):
+                    if t and truck_times[t] == truck_times[t - 1]:
+                        continue
+                    before, after, start = truck_times[:t], truck_times[t + 1:], truck_times[t]
+                    for _, new_state_code, trip_time in trips:
+                        finish = start + trip_time
+                        slot = bisect_right(after, finish)
+                        add_move((new_state_code, before + after[:slot] + (finish,) + after[slot:]))
+
+            # Skip next states whose lower bound already reaches best_makespan
+            while done < len(moves):
+                nxt = moves[done]
+                makespan = memo_get(nxt)
+                if makespan is not None:
+                    if makespan < best_makespan:
+                        best_makespan = makespan
+                elif lower_bound(nxt) < best_makespan:
+                    break
+                done += 1
+            frame[2], frame[3] = done, best_makespan
+
+            if done < len(moves):
+                stack.append([moves[done], None, 0, float('inf')])
+            else:
+                remember(memo_key, best_makespan)
+                stack.pop()
+        return memo[root]
+
+    def best_assignment(state, truck_times):
+        """The trip to make next from this state and truck times (None once every mine is empty):
+        the first (truck, trip) in truck order and trip order that reaches the minimum makespan."""
+        state_code = pack(state, state_bits)
+        if state_code == 0:
+            return None
+        min_makespan = float('inf')
+        best = None
+        for truck_id, combo, new_state_code, new_truck_times in next_trips(state_code, truck_times, range(num_trucks)):
+            nxt = (new_state_code, tuple(sorted(new_truck_times)))
+            # Next states the search skipped were bounded out, but the real truck order here can
+            # meet them before the move that bounded them out, so those are solved now
+            if nxt not in memo:
+                if lower_bound(nxt) >= min_makespan:
+                    continue
+                dp(nxt)
+            makespan = memo[nxt]
+            if makespan < min_makespan:
+                min_makespan = makespan
+                best = (truck_id, *best_trips[combo])
+        return best
 
     initial_truck_times = tuple([0] * num_trucks)
-    initial_truck_locations = tuple([dump_site] * num_trucks)
-    min_total_time = dp(initial_state, initial_truck_times, initial_truck_locations)
+    try:
+        min_total_time = dp((pack(initial_state, state_bits), initial_truck_times))
+    finally:
+        solving = False
+        if pool is not None:
+            pool.shutdown()
+            pool = None
 
-    return min_total_time, memo, choice
+    return min_total_time, memo, best_assignment
 
 def dp_min_time_multi_truck_with_procedure(node_capacities, truck_capacity, adjacency, dump_site, num_trucks=3):
     mines = [node for node in node_capacities if node != dump_site]
     initial_state = tuple(node_capacities[mine] for mine in mines)
 
-    min_total_time, memo, choice = dp_min_time_multi_truck(node_capacities, truck_capacity, adjacency, dump_site, num_trucks)
+    paths = all_pairs_shortest_paths(adjacency, node_capacities)
+    min_total_time, memo, best_assignment = dp_min_time_multi_truck(node_capacities, truck_capacity, adjacency, dump_site, num_trucks, paths)
 
-    # Reconstruct the optimal procedure
-    print(f"--- DP-based Optimal {num_trucks}-Truck Procedure ---")
-    print(f"Minimum makespan: {min_total_time}s")
+    # Reconstruct the optimal procedure (lines are collected and written out in one go at the end)
+    log = []
+    log.append(f"--- DP-based Optimal {num_trucks}-Truck Procedure ---")
+    log.append(f"Minimum makespan: {min_total_time}s")
 
     state = initial_state
     truck_times = tuple([0] * num_trucks)
-    truck_locations = tuple([dump_site] * num_trucks)
 
     step = 1
     cumulative_times = [0] * num_trucks
 
-    while not all(coal == 0 for coal in state):
-        key = (state, truck_times, truck_locations)
-        assignment = choice[key]
+    while any(state):
+        assignment = best_assignment(state, truck_times)
 
         if assignment is None:
             break
 
         truck_id, order, mines_order, route, trip_time = assignment
 
-        print(f"\nTrip {step}: Truck {truck_id + 1}")
-        print(f"Route: {' -> '.join(route)} (Trip time: {trip_time}s)")
+        log.append(f"\nTrip {step}: Truck {truck_id + 1}")
+        log.append(f"Route: {' -> '.join(route)} (Trip time: {trip_time}s)")
 
         # Update state and truck info
         new_state = list(state)
         remaining_capacity = truck_capacity
         collected_this_trip = 0
 
-        current_location = truck_locations[truck_id]
+        # Every trip starts from the dump site; the leg times and paths come from the precomputed table
+        current_location = dump_site
 
         # Detailed step-by-step for this trip
         for idx, mine in enumerate(mines_order):
-            t, path = dijkstra(adjacency, current_location, mine)
-            print(f"  {current_location} -> {mine}: Time Taken: {t}s")
+            t, path = paths[(current_location, mine)]
+            log.append(f"  {current_location} -> {mine}: Time Taken: {t}s")
 
             take = min(new_state[order[idx]], remaining_capacity)
-            print(f"  Truck loaded {take}kg coal at {mine}")
-            print(f"  Loading time at {mine}: {LOAD_UNLOAD_TIME}s")
+            log.append(f"  Truck loaded {take}kg coal at {mine}")
+            log.append(f"  Loading time at {mine}: {LOAD_UNLOAD_TIME}s")
 
             remaining_capacity -= take
             new_state[order[idx]] -= take
@@ -229,32 +479,30 @@ def dp_min_time_multi_truck_with_procedure(node_capacities, truck_capacity, adja
             current_location = mine
 
         # Return to dump site
-        t, path = dijkstra(adjacency, current_location, dump_site)
-        print(f"  {current_location} -> {' -> '.join(path[1:])}: Time Taken: {t}s")
-        print(f"  Truck unloaded at {dump_site}: Collected: {collected_this_trip}kg")
-        print(f"  Unloading time at {dump_site}: {LOAD_UNLOAD_TIME}s")
+        t, path = paths[(current_location, dump_site)]
+        log.append(f"  {current_location} -> {' -> '.join(path[1:])}: Time Taken: {t}s")
+        log.append(f"  Truck unloaded at {dump_site}: Collected: {collected_this_trip}kg")
+        log.append(f"  Unloading time at {dump_site}: {LOAD_UNLOAD_TIME}s")
 
-        # Update truck times and locations
+        # Update truck times
         new_truck_times = list(truck_times)
-        new_truck_locations = list(truck_locations)
         new_truck_times[truck_id] += trip_time
-        new_truck_locations[truck_id] = dump_site
         cumulative_times[truck_id] = new_truck_times[truck_id]
 
-        print(f"  Truck {truck_id + 1} completion time: {cumulative_times[truck_id]}s")
+        log.append(f"  Truck {truck_id + 1} completion time: {cumulative_times[truck_id]}s")
 
         state = tuple(new_state)
         truck_times = tuple(new_truck_times)
-        truck_locations = tuple(new_truck_locations)
         step += 1
 
     # Final summary
-    print(f"\n--- Final Summary ---")
+    log.append(f"\n--- Final Summary ---")
     for truck_id in range(num_trucks):
-        print(f"Truck {truck_id + 1} finished at: {cumulative_times[truck_id]}s")
+        log.append(f"Truck {truck_id + 1} finished at: {cumulative_times[truck_id]}s")
 
-    print(f"Overall makespan: {max(cumulative_times)}s")
-    print(f"All mines depleted. Total trips: {step-1}.")
+    log.append(f"Overall makespan: {max(cumulative_times)}s")
+    log.append(f"All mines depleted. Total trips: {step-1}.")
+    print("\n".join(log))
 
     return min_total_time
 
@@ -286,23 +534,23 @@ def print_multi_truck_table(truck_states, current_time):
     # Display current time at the bottom
     print(f"\nCurrent Simulation Time: {current_time}s")
 
-def realtime_multi_truck_progress(node_capacities, truck_capacity, adjacency, dump_site, num_trucks=3):
-    """Real-time parallel simulation for multiple trucks"""
+def realtime_multi_truck_progress(node_capacities, truck_capacity, adjacency, dump_site, num_trucks=3, speed=1):
+    """Real-time parallel simulation for multiple trucks.
+    speed is simulated seconds per wall-clock second (1 = real time); 0 runs without waiting."""
     mines = [node for node in node_capacities if node != dump_site]
     initial_state = tuple(node_capacities[mine] for mine in mines)
 
     # Get optimal solution first
-    min_total_time, memo, choice = dp_min_time_multi_truck(node_capacities, truck_capacity, adjacency, dump_site, num_trucks)
+    paths = all_pairs_shortest_paths(adjacency, node_capacities)
+    min_total_time, memo, best_assignment = dp_min_time_multi_truck(node_capacities, truck_capacity, adjacency, dump_site, num_trucks, paths)
 
     # Reconstruct all trips for each truck
     state = initial_state
     truck_times = [0] * num_trucks
-    truck_locations = [dump_site] * num_trucks
     truck_schedules = [[] for _ in range(num_trucks)]  # List of actions per truck
 
-    while not all(coal == 0 for coal in state):
-        key = (tuple(state), tuple(truck_times), tuple(truck_locations))
-        assignment = choice.get(key)
+    while any(state):
+        assignment = best_assignment(state, tuple(truck_times))
         if assignment is None:
             break
 
@@ -310,13 +558,13 @@ def realtime_multi_truck_progress(node_capacities, truck_capacity, adjacency, du
 
         # Build detailed action list for this trip
         actions = []
-        current_location = truck_locations[truck_id]
+        current_location = dump_site  # Every trip starts from the dump site
         for idx, mine in enumerate(mines_order):
-            t, _ = dijkstra(adjacency, current_location, mine)
+            t, _ = paths[(current_location, mine)]
             actions.append({'type': 'travel', 'to': mine, 'duration': t})
             actions.append({'type': 'load', 'at': mine, 'duration': LOAD_UNLOAD_TIME})
             current_location = mine
-        t, _ = dijkstra(adjacency, current_location, dump_site)
+        t, _ = paths[(current_location, dump_site)]
         actions.append({'type': 'travel', 'to': dump_site, 'duration': t})
         actions.append({'type': 'unload', 'at': dump_site, 'duration': LOAD_UNLOAD_TIME})
 
@@ -331,82 +579,79 @@ def realtime_multi_truck_progress(node_capacities, truck_capacity, adjacency, du
             new_state[i] -= take
         state = tuple(new_state)
 
-        # Update truck time and location (for reconstruction only)
+        # Update truck time (for reconstruction only)
         truck_times[truck_id] += trip_time
-        truck_locations[truck_id] = dump_site
 
-    # Now simulate the timeline
+    # Now simulate the timeline. Each truck runs its trips back to back from time 0, so instead of
+    # stepping every truck through every second, a heap holds each truck's next action change as
+    # (time, truck_id, action index) and only those changes are applied.
+    actions_of = [[action for actions in schedule for action in actions] for schedule in truck_schedules]
+    events = [(0, truck_id, 0) for truck_id in range(num_trucks)]
+    heapq.heapify(events)
+
     global_time = 0
     truck_states = [{
         'status': 'Waiting...',
         'progress': 0,
         'percent': 0,
         'capacity': truck_capacity,
-        'current_trip': 0,
-        'current_action': 0,
-        'action_time_left': 0,
+        'action': None,
+        'started': 0,
         'loaded': 0
     } for _ in range(num_trucks)]
 
     print('\n' * (num_trucks * 7 + 2))  # Space for tables + time
 
-    all_done = False
-    while not all_done:
-        all_done = True
-        for truck_id in range(num_trucks):
+    while True:
+        # Start every action that begins now (zero-length ones pass straight through)
+        while events and events[0][0] <= global_time:
+            _, truck_id, index = heapq.heappop(events)
             truck = truck_states[truck_id]
-            schedule = truck_schedules[truck_id]
 
-            if truck['current_trip'] >= len(schedule):
+            if index >= len(actions_of[truck_id]):
                 truck['status'] = 'Idle'
                 truck['progress'] = 22
                 truck['percent'] = 100
+                truck['action'] = None
                 continue
 
-            all_done = False
-            actions = schedule[truck['current_trip']]
-
-            if truck['action_time_left'] <= 0:
-                # Start next action
-                action = actions[truck['current_action']]
-                truck['action_time_left'] = action['duration']
-                if action['type'] == 'travel':
-                    truck['status'] = f"Travel to {action['to']}"
-                elif action['type'] == 'load':
-                    truck['status'] = f"Loading at {action['at']}"
-                    # Simulate loading (increase loaded)
-                    truck['loaded'] = min(truck['loaded'] + 1, truck_capacity)  # Simplified; adjust if needed
-                elif action['type'] == 'unload':
-                    truck['status'] = f"Unloading at {action['at']}"
-                    # Simulate unloading (reset loaded)
-                    truck['loaded'] = 0
-                truck['progress'] = 0
-                truck['percent'] = 0
-
-            # Advance this truck's action by 1 second
-            if truck['action_time_left'] > 0:
-                truck['action_time_left'] -= 1
-                total_duration = actions[truck['current_action']]['duration']
-                elapsed = total_duration - truck['action_time_left']
+            action = actions_of[truck_id][index]
+            if action['type'] == 'travel':
+                truck['status'] = f"Travel to {action['to']}"
+            elif action['type'] == 'load':
+                truck['status'] = f"Loading at {action['at']}"
+                # Simulate loading (increase loaded)
+                truck['loaded'] = min(truck['loaded'] + 1, truck_capacity)  # Simplified; adjust if needed
+            elif action['type'] == 'unload':
+                truck['status'] = f"Unloading at {action['at']}"
+                # Simulate unloading (reset loaded)
+                truck['loaded'] = 0
+            truck['action'] = action
+            truck['started'] = global_time
+            heapq.heappush(events, (global_time + action['duration'], truck_id, index + 1))
+
+        # Progress of each running action, counting the current second
+        for truck in truck_states:
+            if truck['action'] is not None:
+                total_duration = truck['action']['duration']
+                elapsed = global_time - truck['started'] + 1
                 truck['progress'] = int((elapsed / total_duration) * 22)
                 truck['percent'] = int((elapsed / total_duration) * 100)
                 truck['capacity'] = truck_capacity - truck['loaded']  # Remaining capacity
 
-                if truck['action_time_left'] == 0:
-                    # Action complete, move to next
-                    truck['current_action'] += 1
-                    if truck['current_action'] >= len(actions):
-                        # Trip complete, move to next trip
-                        truck['current_trip'] += 1
-                        truck['current_action'] = 0
-
         # Update display
         print_multi_truck_table(truck_states, global_time)
-        time.sleep(1)  # Real-time delay
+        if speed > 0:
+            time.sleep(1.0 / speed)  # Real-time delay, scaled by speed
 
-        global_time += 1
+        if not events:
+            # Every truck is idle
+            global_time += 1
+            break
+        # When played back every second is shown; with speed 0 the clock jumps straight to the next change
+        global_time = global_time + 1 if speed > 0 else min(events[0][0], min_total_time)
         if global_time >= min_total_time:
-            all_done = True
+            break
 
     # Final display
     final_states = [{
@@ -418,7 +663,19 @@ def realtime_multi_truck_progress(node_capacities, truck_capacity, adjacency, du
     print_multi_truck_table(final_states, global_time)
     print(f"\nAll mines depleted. Total makespan: {min_total_time}s.")
 
-if __name__ == "__main__":
+def main():
+    # Loading and plotting only happen when run as a script, so importing this module stays cheap.
+    # The map image is only drawn on request (python Algorithm.py --map); the solver never needs it.
+    edges = read_edges()
+    if "--map" in sys.argv[1:]:
+        draw_network(edges)
+    # The solvers only read the capacities (the remaining coal lives in their own state), so no copy is needed
+    node_capacities = read_node_capacities()
+    adjacency = build_adjacency(edges)
+
+    # Initialize truck
+    truck = Truck(truck_id=1, capacity=TRUCK_CAPACITY, location='Dump_site')
+
     print("Choose mode:")
     print("1. Direct solution (minimal time, full procedure)")
     print("2. Realtime progress (step-by-step visualization)")
@@ -427,13 +684,18 @@ if __name__ == "__main__":
     mode = input("Enter 1 for Direct solution or 2 for Realtime progress: ").strip()
     num_trucks = int(input("Enter number of trucks (e.g., 1 for single truck, 3 for multi-truck): "))
 
-    dp_node_capacities = copy.deepcopy(node_capacities)
+    # Realtime playback speed: --speed 100 (or 100x) plays 100 simulated seconds per second, --speed 0 doesn't wait
+    speed = 1
+    if "--speed" in sys.argv[1:-1]:
+        speed = float(sys.argv[sys.argv.index("--speed") + 1].rstrip("x"))
 
     if mode == "1":
-        dp_min_time_multi_truck_with_procedure(dp_node_capacities, truck.capacity, adjacency, 'Dump_site', num_trucks)
+        dp_min_time_multi_truck_with_procedure(node_capacities, truck.capacity, adjacency, 'Dump_site', num_trucks)
     elif mode == "2":
         print(f"--- Realtime progress mode selected ({num_trucks} trucks) ---")
-        realtime_multi_truck_progress(dp_node_capacities, truck.capacity, adjacency, 'Dump_site', num_trucks)
+        realtime_multi_truck_progress(node_capacities, truck.capacity, adjacency, 'Dump_site', num_trucks, speed)
     else:
         print("Invalid option. Please run again and select 1 or 2.")
 
+if __name__ == "__main__":
+    main()
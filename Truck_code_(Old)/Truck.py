@@ -1,7 +1,7 @@
 import pygame
 import sys
-import time
-import math
+from collections import deque
+from enum import IntEnum
 
 # Initialize Pygame
 pygame.init()
@@ -21,6 +21,31 @@ CYAN = (0, 255, 255)
 # Screen dimensions
 WIDTH, HEIGHT = 1200, 700
 
+# Closest a truck may follow the one ahead on the same road, squared (pixels)
+MIN_SPACING_SQ = 35 * 35
+
+# Trucks move in fixed steps of simulated time, however long each frame takes to draw
+FIXED_DT = 1 / 120
+# Longest frame time caught up in one go, so a stall does not turn into a burst of steps
+MAX_FRAME_TIME = 0.25
+
+# Truck states, numbered so per-state handlers and names can be looked up by index
+class State(IntEnum):
+    TO_MINE = 0
+    LOADING = 1
+    TO_DUMP = 2
+    UNLOADING = 3
+    WAITING = 4
+    FINISHED = 5
+
+# State names as shown in the truck status panel, indexed by State
+STATE_NAMES = ('To Mine', 'Loading', 'To Dump', 'Unloading', 'Waiting', 'Finished')
+
+# Progress bar over a truck part way through a timed state: (offset below the truck, fill color)
+PROGRESS_BARS = {State.LOADING: (-20, YELLOW), State.UNLOADING: (20, BLUE)}
+# Status line color by state; other trucks are GREEN when loaded and BLACK when empty
+STATUS_COLORS = {State.LOADING: BLUE, State.WAITING: ORANGE}
+
 def get_user_input():
     print("=== Multi-Truck Coal Mine Simulation Setup ===")
     try:
@@ -46,112 +71,151 @@ def get_user_input():
         return get_user_input()
 
 class Truck:
+    # Fixed attribute slots instead of a per-instance __dict__; trucks are read many times per step
+    __slots__ = ('id', 'capacity', 'speed_pps', 'step', 'load_time', 'dump_site_pos', 'coal_mine_pos', 'position',
+                 'state', 'busy_until', 'cargo', 'trips_completed', 'color', 'road_offset', 'mine_stop', 'dump_stop')
+
     def __init__(self, truck_id, capacity, speed_pps, load_time, dump_site_pos, coal_mine_pos, color):
         self.id = truck_id
         self.capacity = capacity
         self.speed_pps = speed_pps
+        self.step = speed_pps * FIXED_DT  # pixels moved per physics step
         self.load_time = load_time
         self.dump_site_pos = dump_site_pos
         self.coal_mine_pos = coal_mine_pos
         self.position = list(dump_site_pos)
-        self.state = 'to_mine'  # to_mine, loading, to_dump, unloading, waiting
-        self.load_timer = 0
+        self.state = State.TO_MINE
+        self.busy_until = 0  # simulation time the current loading/unloading finishes at
         self.cargo = 0
         self.trips_completed = 0
         self.color = color
         self.road_offset = 30  # vertical offset for road separation
-
-    def update(self, dt, coal_mine, loading_queue, trucks):
-        min_spacing = 35  # pixels
-        if self.state == 'to_mine':
-            # Move horizontally on upper road
-            target_x = self.coal_mine_pos[0]
-            target_y = self.coal_mine_pos[1] - self.road_offset
-            # Find truck ahead
-            ahead = None
-            for t in trucks:
-                if t.id < self.id and t.state == 'to_mine':
-                    ahead = t
-            if ahead:
-                dx = ahead.position[0] - self.position[0]
-                dy = ahead.position[1] - self.position[1]
-                dist = math.sqrt(dx**2 + dy**2)
-                if dist < min_spacing:
-                    return
-            # Move horizontally until near coal mine
-            if abs(self.position[0] - target_x) > 5:
-                direction = (target_x - self.position[0], 0)
-                move_dist = self.speed_pps * dt
-                self.position[0] += math.copysign(min(move_dist, abs(direction[0])), direction[0])
-                self.position[1] = target_y
-            else:
-                self.position[0] = target_x
-                self.position[1] = target_y
-                if coal_mine.coal_amount > 0:
-                    if self.id not in loading_queue:
-                        loading_queue.append(self.id)
-                    if loading_queue and loading_queue[0] == self.id and not any(truck.state == 'loading' for truck in trucks if truck.id != self.id):
-                        self.state = 'loading'
-                        self.load_timer = 0
-                    else:
-                        self.state = 'waiting'
-        elif self.state == 'to_dump':
-            # Move horizontally on lower road
-            target_x = self.dump_site_pos[0]
-            target_y = self.dump_site_pos[1] + self.road_offset
-            ahead = None
-            for t in trucks:
-                if t.id < self.id and t.state == 'to_dump':
-                    ahead = t
-            if ahead:
-                dx = ahead.position[0] - self.position[0]
-                dy = ahead.position[1] - self.position[1]
-                dist = math.sqrt(dx**2 + dy**2)
-                if dist < min_spacing:
-                    return
-            if abs(self.position[0] - target_x) > 5:
-                direction = (target_x - self.position[0], 0)
-                move_dist = self.speed_pps * dt
-                self.position[0] += math.copysign(min(move_dist, abs(direction[0])), direction[0])
-                self.position[1] = target_y
-            else:
-                self.position[0] = target_x
-                self.position[1] = target_y
-                self.state = 'unloading'
-                self.load_timer = 0
-        elif self.state == 'waiting':
-            # Wait for turn to load
-            if loading_queue and loading_queue[0] == self.id and coal_mine.coal_amount > 0 and not any(truck.state == 'loading' for truck in trucks if truck.id != self.id):
-                self.state = 'loading'
-                self.load_timer = 0
-
-        elif self.state == 'loading':
-            self.load_timer += dt
-            if self.load_timer >= self.load_time:
-                load_amount = min(self.capacity, coal_mine.coal_amount)
-                self.cargo = load_amount
-                coal_mine.coal_amount -= load_amount
-                self.state = 'to_dump'
-                # Remove from loading queue
-                if self.id in loading_queue:
+        # Where each road ends: the mine's end of the upper road and the dump site's end of the lower one
+        self.mine_stop = (coal_mine_pos[0], coal_mine_pos[1] - self.road_offset)
+        self.dump_stop = (dump_site_pos[0], dump_site_pos[1] + self.road_offset)
+
+    def update(self, now, coal_mine, loading_queue, queued, ahead):
+        # One handler per state, looked up by the state's number
+        STATE_HANDLERS[self.state](self, now, coal_mine, loading_queue, queued, ahead)
+
+    def drive_to_mine(self, now, coal_mine, loading_queue, queued, ahead):
+        # Move horizontally on upper road
+        target_x, target_y = self.mine_stop
+        # Keep behind the truck ahead
+        if ahead:
+            dx = ahead.position[0] - self.position[0]
+            dy = ahead.position[1] - self.position[1]
+            if dx * dx + dy * dy < MIN_SPACING_SQ:
+                return
+        # Move horizontally until near coal mine
+        distance = target_x - self.position[0]
+        if abs(distance) > 5:
+            # One step towards the target, without passing it
+            if distance > self.step:
+                distance = self.step
+            elif distance < -self.step:
+                distance = -self.step
+            self.position[0] += distance
+            self.position[1] = target_y
+        else:
+            self.position[0] = target_x
+            self.position[1] = target_y
+            if coal_mine.coal_amount > 0:
+                if self.id not in queued:
+                    loading_queue.append(self.id)
+                    queued.add(self.id)
+                if loading_queue and loading_queue[0] == self.id and not coal_mine.trucks_loading:
+                    self.state = State.LOADING
+                    coal_mine.trucks_loading += 1
+                    self.busy_until = now + self.load_time
+                else:
+                    self.state = State.WAITING
+
+    def drive_to_dump(self, now, coal_mine, loading_queue, queued, ahead):
+        # Move horizontally on lower road
+        target_x, target_y = self.dump_stop
+        if ahead:
+            dx = ahead.position[0] - self.position[0]
+            dy = ahead.position[1] - self.position[1]
+            if dx * dx + dy * dy < MIN_SPACING_SQ:
+                return
+        distance = target_x - self.position[0]
+        if abs(distance) > 5:
+            # One step towards the target, without passing it
+            if distance > self.step:
+                distance = self.step
+            elif distance < -self.step:
+                distance = -self.step
+            self.position[0] += distance
+            self.position[1] = target_y
+        else:
+            self.position[0] = target_x
+            self.position[1] = target_y
+            self.state = State.UNLOADING
+            self.busy_until = now + self.load_time
+
+    def wait(self, now, coal_mine, loading_queue, queued, ahead):
+        # Wait for turn to load
+        if loading_queue and loading_queue[0] == self.id and coal_mine.coal_amount > 0 and not coal_mine.trucks_loading:
+            self.state = State.LOADING
+            coal_mine.trucks_loading += 1
+            self.busy_until = now + self.load_time
+
+    def load(self, now, coal_mine, loading_queue, queued, ahead):
+        if now >= self.busy_until:
+            load_amount = min(self.capacity, coal_mine.coal_amount)
+            self.cargo = load_amount
+            coal_mine.coal_amount -= load_amount
+            self.state = State.TO_DUMP
+            coal_mine.trucks_loading -= 1
+            # Remove from loading queue
+            if self.id in queued:
+                queued.discard(self.id)
+                # Only the truck at the front of the queue ever loads
+                if loading_queue[0] == self.id:
+                    loading_queue.popleft()
+                else:
                     loading_queue.remove(self.id)
 
-        elif self.state == 'unloading':
-            self.load_timer += dt
-            if self.load_timer >= self.load_time:
-                coal_mine.dumped_coal += self.cargo
-                self.cargo = 0
-                self.trips_completed += 1
-                if coal_mine.coal_amount > 0:
-                    self.state = 'to_mine'
-                else:
-                    self.state = 'finished'
+    def unload(self, now, coal_mine, loading_queue, queued, ahead):
+        if now >= self.busy_until:
+            coal_mine.dumped_coal += self.cargo
+            self.cargo = 0
+            self.trips_completed += 1
+            if coal_mine.coal_amount > 0:
+                self.state = State.TO_MINE
+            else:
+                self.state = State.FINISHED
+
+    def finish(self, now, coal_mine, loading_queue, queued, ahead):
+        pass
+
+# Truck.update's handlers, indexed by State
+STATE_HANDLERS = (Truck.drive_to_mine, Truck.load, Truck.drive_to_dump, Truck.unload, Truck.wait, Truck.finish)
+
+def update_trucks(trucks, now, coal_mine, loading_queue, queued):
+    # Advance the whole fleet in one pass. Trucks are updated in id order, so the truck ahead on a
+    # road (the highest id below this one in the same state) is simply the last truck updated so
+    # far that ended up in that state.
+    last_in_state = {}
+    for truck in trucks:
+        state = truck.state
+        # busy_until is only ahead of now part way through loading or unloading, and a finished
+        # truck never changes again, so neither needs calling into until there is work to do
+        if now >= truck.busy_until and state != State.FINISHED:
+            truck.update(now, coal_mine, loading_queue, queued, last_in_state.get(state))
+            state = truck.state
+        last_in_state[state] = truck
 
 class CoalMine:
+    __slots__ = ('initial_coal', 'coal_amount', 'dumped_coal', 'trucks_loading')
+
     def __init__(self, initial_coal):
         self.initial_coal = initial_coal
         self.coal_amount = initial_coal
         self.dumped_coal = 0
+        # Trucks loading right now, counted as they start and finish rather than found by scanning the fleet
+        self.trucks_loading = 0
 
 def run_simulation():
     # Get user input
@@ -189,24 +253,107 @@ def run_simulation():
 
     # Initialize coal mine
     coal_mine = CoalMine(coal_amount)
-    loading_queue = []  # Queue for trucks waiting to load
+    loading_queue = deque()  # Queue for trucks waiting to load
+    queued = set()  # The same truck ids, for membership checks
 
     # Font
     font = pygame.font.SysFont(None, 20)
     big_font = pygame.font.SysFont(None, 24)
 
+    # Text that never changes is rendered once here instead of every frame
+    dump_text = big_font.render('DUMP SITE', True, BLACK)
+    mine_text = big_font.render('COAL MINE', True, WHITE)
+    truck_header = big_font.render("TRUCK STATUS:", True, BLACK)
+    completion_text = big_font.render("SIMULATION COMPLETE!", True, RED)
+    completion_pos = (WIDTH//2 - 100, HEIGHT - 80)
+    total_time_pos = (WIDTH//2 - 80, HEIGHT - 60)
+    instruction = font.render("Press ESC to exit", True, BLACK)
+    legend_text = font.render("Legend:", True, BLACK)
+    legend_items = [
+        (font.render(item, True, BLACK), color) for item, color in [
+            ("Empty truck", RED),
+            ("Loaded truck", BLUE),
+            ("Loading", YELLOW),
+            ("Waiting", ORANGE)
+        ]
+    ]
+
+    # Truck bodies, one per cargo color, and each truck's id label, for drawing all trucks in one blits call
+    truck_bodies = {}
+    for color in (RED, BLUE):
+        truck_bodies[color] = pygame.Surface((24, 16))
+        truck_bodies[color].fill(color)
+    id_texts = [font.render(str(truck.id + 1), True, WHITE) for truck in trucks]
+
+    # Lines that only change when a truck changes state or a load is moved (truck status, coal
+    # left, ...) come back many frames in a row, so their rendered surfaces are kept by text and color
+    text_cache = {}
+
+    def render_cached(text, color):
+        surface = text_cache.get((text, color))
+        if surface is None:
+            surface = text_cache[(text, color)] = font.render(text, True, color)
+        return surface
+
+    # Lines whose text keeps changing (clock, efficiency, total time) are never seen twice, so each just
+    # keeps its latest surface and is only rendered again once its text is different
+    line_surfaces = {}
+
+    def render_line(name, text, color):
+        last = line_surfaces.get(name)
+        if last is None or last[0] != text:
+            last = line_surfaces[name] = (text, font.render(text, True, color))
+        return last[1]
+
+    # Everything that never moves (roads, sites, legend, exit hint) is drawn once onto a background
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill(WHITE)
+
+    # Draw roads (two parallel lines)
+    upper_road_offset = 30
+    lower_road_offset = 30
+    # Upper road: dump site to coal mine (for going)
+    pygame.draw.line(background, GRAY, (dump_site_pos[0], dump_site_pos[1] - upper_road_offset), (coal_mine_pos[0], coal_mine_pos[1] - upper_road_offset), 8)
+    # Lower road: coal mine to dump site (for returning)
+    pygame.draw.line(background, GRAY, (coal_mine_pos[0], coal_mine_pos[1] + lower_road_offset), (dump_site_pos[0], dump_site_pos[1] + lower_road_offset), 8)
+
+    # Draw dump site
+    pygame.draw.rect(background, GREEN, (dump_site_pos[0]-35, dump_site_pos[1]-35, 70, 70))
+    background.blit(dump_text, (dump_site_pos[0]-45, dump_site_pos[1]-60))
+
+    # Draw coal mine
+    pygame.draw.rect(background, BLACK, (coal_mine_pos[0]-35, coal_mine_pos[1]-35, 70, 70))
+    background.blit(mine_text, (coal_mine_pos[0]-45, coal_mine_pos[1]-60))
+
+    # Instructions
+    background.blit(instruction, (WIDTH - 150, HEIGHT - 30))
+
+    # Legend
+    legend_y = HEIGHT - 150
+    background.blit(legend_text, (WIDTH - 150, legend_y))
+    legend_y += 20
+
+    for text, color in legend_items:
+        pygame.draw.rect(background, color, (WIDTH - 150, legend_y, 15, 15))
+        background.blit(text, (WIDTH - 130, legend_y))
+        legend_y += 18
+
+    # Areas drawn over the background last frame; the first frame shows the whole screen
+    screen.blit(background, (0, 0))
+    previous_rects = [screen.get_rect()]
+
     running = True
-    last_time = time.time()
     simulation_time = 0
+    accumulator = 0  # frame time not yet simulated
+    last_frame_state = None
+    last_panel_key = None
+    panel_rects = []  # where the info panel's lines are on screen
 
     print("Pygame window should now be visible!")
 
     while running:
-        # Calculate delta time
-        current_time = time.time()
-        dt = current_time - last_time
-        last_time = current_time
-        simulation_time += dt
+        # Calculate delta time: clock.tick holds the frame rate at 60 and returns the ms since the last frame
+        accumulator += min(clock.tick(60) / 1000, MAX_FRAME_TIME)
 
         # Handle events
         for event in pygame.event.get():
@@ -216,66 +363,38 @@ def run_simulation():
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
-        # Update all trucks
-        for truck in trucks:
-            truck.update(dt, coal_mine, loading_queue, trucks)
-
-        # Clear screen
-        screen.fill(WHITE)
-
-        # Draw roads (two parallel lines)
-        upper_road_offset = 30
-        lower_road_offset = 30
-        # Upper road: dump site to coal mine (for going)
-        pygame.draw.line(screen, GRAY, (dump_site_pos[0], dump_site_pos[1] - upper_road_offset), (coal_mine_pos[0], coal_mine_pos[1] - upper_road_offset), 8)
-        # Lower road: coal mine to dump site (for returning)
-        pygame.draw.line(screen, GRAY, (coal_mine_pos[0], coal_mine_pos[1] + lower_road_offset), (dump_site_pos[0], dump_site_pos[1] + lower_road_offset), 8)
-
-        # Draw dump site
-        pygame.draw.rect(screen, GREEN, (dump_site_pos[0]-35, dump_site_pos[1]-35, 70, 70))
-        dump_text = big_font.render('DUMP SITE', True, BLACK)
-        screen.blit(dump_text, (dump_site_pos[0]-45, dump_site_pos[1]-60))
-
-        # Draw coal mine
-        pygame.draw.rect(screen, BLACK, (coal_mine_pos[0]-35, coal_mine_pos[1]-35, 70, 70))
-        mine_text = big_font.render('COAL MINE', True, WHITE)
-        screen.blit(mine_text, (coal_mine_pos[0]-45, coal_mine_pos[1]-60))
-
-        # Draw trucks
-        for truck in trucks:
-            # Set truck color: RED if empty, BLUE if loaded
-            if truck.cargo == 0:
-                truck_color = RED
-            else:
-                truck_color = BLUE
-            pygame.draw.rect(screen, truck_color, (truck.position[0]-12, truck.position[1]-8, 24, 16))
-
-            # Draw truck ID
-            id_text = font.render(str(truck.id + 1), True, WHITE)
-            screen.blit(id_text, (truck.position[0]-5, truck.position[1]-5))
-
-            # Draw loading progress
-            if truck.state == 'loading':
-                progress = truck.load_timer / truck.load_time
-                pygame.draw.rect(screen, GRAY, (truck.position[0]-15, truck.position[1]-20, 30, 6))
-                pygame.draw.rect(screen, YELLOW, (truck.position[0]-15, truck.position[1]-20, 30*progress, 6))
-            # Draw unloading progress (at dump site)
-            if truck.state == 'unloading':
-                progress = truck.load_timer / truck.load_time
-                pygame.draw.rect(screen, GRAY, (truck.position[0]-15, truck.position[1]+20, 30, 6))
-                pygame.draw.rect(screen, BLUE, (truck.position[0]-15, truck.position[1]+20, 30*progress, 6))
+        # Update all trucks, one fixed step at a time
+        while accumulator >= FIXED_DT:
+            simulation_time += FIXED_DT
+            update_trucks(trucks, simulation_time, coal_mine, loading_queue, queued)
+            accumulator -= FIXED_DT
 
-            # Draw waiting indicator
-            if truck.state == 'waiting':
-                pygame.draw.circle(screen, YELLOW, (int(truck.position[0]), int(truck.position[1]-15)), 5)
-
-        # Display simulation information
+        # Everything this frame would show. While none of it changes (trucks parked loading or
+        # finished, between clock ticks on the panel) the screen is already right, so the frame is skipped.
+        efficiency = (coal_mine.dumped_coal / (simulation_time * num_trucks)) if simulation_time > 0 else 0
+        efficiency_line = f"Efficiency: {efficiency:.1f} kg/truck/second"
+        # Trucks are drawn at whole pixels, so positions are truncated once here for the comparison
+        # and the drawing below; a slow truck then only costs a redraw when it reaches the next pixel.
+        pixels = [(int(truck.position[0]), int(truck.position[1])) for truck in trucks]
+        frame_state = (f"{simulation_time:.1f}", efficiency_line, coal_mine.coal_amount, coal_mine.dumped_coal, len(loading_queue),
+                       tuple(pixels),
+                       tuple((truck.state, truck.cargo, truck.trips_completed,
+                              truck.busy_until - simulation_time if truck.state in (State.LOADING, State.UNLOADING) else 0)
+                             for truck in trucks))
+        if frame_state == last_frame_state:
+            continue
+        last_frame_state = frame_state
+
+        # Display simulation information. The panel's lines are worked out as (surface, y) first;
+        # they are only drawn when the panel changed or a truck is (or was last frame) under it.
         info_x = 10
         info_y = 10
+        panel_lines = []
 
-        # General info
+        # General info (the clock changes every frame, the rest only now and then)
+        panel_lines.append((render_line('clock', f"Simulation Time: {simulation_time:.1f}s", BLACK), info_y))
+        info_y += 22
         general_info = [
-            f"Simulation Time: {simulation_time:.1f}s",
             f"Coal Remaining: {coal_mine.coal_amount:.0f} kg",
             f"Coal Dumped: {coal_mine.dumped_coal:.0f} kg",
             f"Progress: {(coal_mine.dumped_coal / coal_mine.initial_coal * 100):.1f}%",
@@ -285,78 +404,85 @@ def run_simulation():
 
         for line in general_info:
             if line:  # Skip empty lines
-                text = font.render(line, True, BLACK)
-                screen.blit(text, (info_x, info_y))
+                panel_lines.append((render_cached(line, BLACK), info_y))
             info_y += 22
 
         # Truck status
-        truck_header = big_font.render("TRUCK STATUS:", True, BLACK)
-        screen.blit(truck_header, (info_x, info_y))
+        panel_lines.append((truck_header, info_y))
         info_y += 25
 
         total_trips = 0
         for truck in trucks:
             total_trips += truck.trips_completed
-            truck_info = f"Truck {truck.id + 1}: {truck.state.replace('_', ' ').title()} | " \
+            truck_info = f"Truck {truck.id + 1}: {STATE_NAMES[truck.state]} | " \
                          f"Cargo: {truck.cargo:.0f} kg | Trips: {truck.trips_completed}"
 
             # Color code the text based on truck state
-            text_color = BLACK
-            if truck.state == 'loading':
-                text_color = BLUE
-            elif truck.state == 'waiting':
-                text_color = ORANGE
-            elif truck.cargo > 0:
-                text_color = GREEN
-
-            text = font.render(truck_info, True, text_color)
-            screen.blit(text, (info_x, info_y))
+            text_color = STATUS_COLORS.get(truck.state) or (GREEN if truck.cargo > 0 else BLACK)
+
+            panel_lines.append((render_cached(truck_info, text_color), info_y))
             info_y += 20
 
         # Summary stats
         info_y += 10
-        summary_text = font.render(f"Total Trips Completed: {total_trips}", True, BLACK)
-        screen.blit(summary_text, (info_x, info_y))
+        panel_lines.append((render_cached(f"Total Trips Completed: {total_trips}", BLACK), info_y))
         info_y += 20
 
-        efficiency = (coal_mine.dumped_coal / (simulation_time * num_trucks)) if simulation_time > 0 else 0
-        efficiency_text = font.render(f"Efficiency: {efficiency:.1f} kg/truck/second", True, BLACK)
-        screen.blit(efficiency_text, (info_x, info_y))
+        panel_lines.append((render_line('efficiency', efficiency_line, BLACK), info_y))
+
+        # The cached surfaces are reused while their text is the same, so an unchanged panel has the
+        # very same surfaces. Each truck covers at most 30x47 pixels around its position (body, id,
+        # progress bar or waiting marker).
+        panel_key = tuple(surface for surface, _ in panel_lines)
+        truck_areas = [pygame.Rect(x-16, y-21, 33, 49) for x, y in pixels]
+        redraw_panel = (panel_key != last_panel_key or not panel_rects
+                        or panel_rects[0].unionall(panel_rects).collidelist(truck_areas + previous_rects) != -1)
+
+        # Put the background back only where something was drawn last frame, and note every
+        # area drawn this frame, so only those parts of the window have to be updated
+        for rect in previous_rects:
+            screen.blit(background, rect, rect)
+        if redraw_panel:
+            for rect in panel_rects:
+                screen.blit(background, rect, rect)
+        drawn = []
+
+        # Draw trucks, each body (RED if empty, BLUE if loaded) followed by its ID, all in one call
+        truck_blits = []
+        for truck, (x, y) in zip(trucks, pixels):
+            truck_blits.append((truck_bodies[BLUE if truck.cargo else RED], (x-12, y-8)))
+            truck_blits.append((id_texts[truck.id], (x-5, y-5)))
+        drawn.extend(screen.blits(truck_blits))
+
+        for truck, (x, y) in zip(trucks, pixels):
+            # Draw loading progress (above the truck) or unloading progress (below it, at the dump site)
+            bar = PROGRESS_BARS.get(truck.state)
+            if bar:
+                offset, bar_color = bar
+                progress = 1 - (truck.busy_until - simulation_time) / truck.load_time
+                drawn.append(pygame.draw.rect(screen, GRAY, (x-15, y+offset, 30, 6)))
+                pygame.draw.rect(screen, bar_color, (x-15, y+offset, 30*progress, 6))
+            # Draw waiting indicator
+            elif truck.state == State.WAITING:
+                drawn.append(pygame.draw.circle(screen, YELLOW, (x, y-15), 5))
 
         # Check if simulation is complete
-        all_finished = all(truck.state == 'finished' for truck in trucks)
+        all_finished = all(truck.state == State.FINISHED for truck in trucks)
         if all_finished or coal_mine.coal_amount <= 0:
-            completion_text = big_font.render("SIMULATION COMPLETE!", True, RED)
-            screen.blit(completion_text, (WIDTH//2 - 100, HEIGHT - 80))
-            time_text = font.render(f"Total Time: {simulation_time:.1f} seconds", True, RED)
-            screen.blit(time_text, (WIDTH//2 - 80, HEIGHT - 60))
-
-        # Instructions
-        instruction = font.render("Press ESC to exit", True, BLACK)
-        screen.blit(instruction, (WIDTH - 150, HEIGHT - 30))
-
-        # Legend
-        legend_y = HEIGHT - 150
-        legend_text = font.render("Legend:", True, BLACK)
-        screen.blit(legend_text, (WIDTH - 150, legend_y))
-        legend_y += 20
-
-        legend_items = [
-            ("Empty truck", RED),
-            ("Loaded truck", BLUE),
-            ("Loading", YELLOW),
-            ("Waiting", ORANGE)
-        ]
-
-        for item, color in legend_items:
-            pygame.draw.rect(screen, color, (WIDTH - 150, legend_y, 15, 15))
-            text = font.render(item, True, BLACK)
-            screen.blit(text, (WIDTH - 130, legend_y))
-            legend_y += 18
-
-        # Update display
-        pygame.display.flip()
-        clock.tick(60)
+            drawn.append(screen.blit(completion_text, completion_pos))
+            time_text = render_line('total time', f"Total Time: {simulation_time:.1f} seconds", RED)
+            drawn.append(screen.blit(time_text, total_time_pos))
+
+        # Update display: last frame's areas (now cleared) and this frame's, plus the panel's old
+        # and new lines if it was drawn again
+        updated = previous_rects + drawn
+        if redraw_panel:
+            updated += panel_rects
+            panel_rects = screen.blits([(surface, (info_x, y)) for surface, y in panel_lines])
+            updated += panel_rects
+            last_panel_key = panel_key
+        pygame.display.update(updated)
+        previous_rects = drawn
 
     pygame.quit()
     sys.exit()